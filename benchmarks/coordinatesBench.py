@@ -0,0 +1,88 @@
+# -------------------------------------------------------------------
+# Microbenchmark of Coordinates3D as a set/dictionary key.
+# Compares the current tuple based Coordinates3D against the previous
+# implementation, which hashed a formatted string.
+#
+# Run from the repository root:
+#   python3 benchmarks/coordinatesBench.py [number of coordinates]
+# -------------------------------------------------------------------
+
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maze.util import Coordinates3D
+
+
+
+class LegacyCoordinates3D:
+    """
+    Previous implementation of Coordinates3D, kept here as the baseline.
+    """
+
+    def __init__(self, level: int, row: int, col: int):
+        self.m_level: int = level
+        self.m_r: int = row
+        self.m_c: int = col
+
+    def getRow(self)->int:
+        return self.m_r
+
+    def getCol(self)->int:
+        return self.m_c
+
+    def getLevel(self)->int:
+        return self.m_level
+
+    def __eq__(self, other):
+        if other != None:
+            return self.m_level == other.getLevel() and self.m_r == other.getRow() and self.m_c == other.getCol()
+        else:
+            return False
+
+    def __hash__(self):
+        return hash(str(self.m_level) + '|' + str(self.m_r)+'|'+str(self.m_c))
+
+
+
+def benchmark(coordClass, size: int, repeat: int = 3)->dict:
+    """
+    Times the set and dictionary operations the generators and solvers rely on.
+
+    @param coordClass: Coordinate class to benchmark.
+    @param size: Number of distinct coordinates to use.
+    @param repeat: Number of times each operation is timed, the best time is reported.
+
+    @returns Dictionary of operation name to best time in seconds.
+    """
+    side = max(1, round(size ** (1 / 3)))
+    coords = [coordClass(l, r, c) for l in range(side) for r in range(side) for c in range(side)]
+    # equal but distinct objects, as the generators create new coordinates when looking up neighbours
+    probes = [coordClass(l, r, c) for l in range(side) for r in range(side) for c in range(side)]
+    visited = set(coords)
+    parents = {coord: coord for coord in coords}
+
+    operations = {
+        'set add': lambda: set(coords),
+        'set lookup': lambda: [probe in visited for probe in probes],
+        'dict insert': lambda: {coord: None for coord in coords},
+        'dict lookup': lambda: [parents[probe] for probe in probes],
+        'construct': lambda: [coordClass(l, r, c) for l in range(side) for r in range(side) for c in range(side)],
+    }
+
+    return {name: min(timeit.repeat(op, number=1, repeat=repeat)) for (name, op) in operations.items()}
+
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    legacy = benchmark(LegacyCoordinates3D, size)
+    current = benchmark(Coordinates3D, size)
+
+    print(f'{"operation":<12} {"legacy (s)":>12} {"current (s)":>12} {"speed-up":>10}')
+    for name in legacy:
+        print(f'{name:<12} {legacy[name]:>12.4f} {current[name]:>12.4f} {legacy[name] / current[name]:>9.1f}x')
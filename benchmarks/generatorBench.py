@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------
+# Benchmark of maze generation throughput, in cells per second.
+# By default compares the fast recursive backtracker against the
+# original one; any generator known to GeneratorSelector can be given.
+#
+# Run from the repository root:
+#   python3 benchmarks/generatorBench.py [rows] [cols] [levels] [generator ...]
+# -------------------------------------------------------------------
+
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maze.maze3D import Maze3D
+from maze.gridGraph import GridGraph
+from generatorSelector import GeneratorSelector
+
+
+
+def benchmark(genApproach: str, rowNum: int, colNum: int, levelNum: int, graphClass=None, repeat: int = 3)->float:
+    """
+    Times the generation of a maze, from initialising its cells to the last wall removed.
+
+    @param genApproach: Name of the generator, as passed to GeneratorSelector.construct().
+    @param rowNum: Number of rows of each level.
+    @param colNum: Number of columns of each level.
+    @param levelNum: Number of levels.
+    @param graphClass: Graph backend to use, None for the default one.
+    @param repeat: Number of mazes generated, the best time is reported.
+
+    @returns Best throughput, in cells per second.
+    """
+    best = float('inf')
+    for seed in range(0, repeat):
+        random.seed(seed)
+        maze = Maze3D([(rowNum, colNum)] * levelNum, graphClass() if graphClass is not None else None)
+        generator = GeneratorSelector().construct(genApproach)
+
+        start = time.perf_counter()
+        generator.generateMaze(maze)
+        best = min(best, time.perf_counter() - start)
+
+    return rowNum * colNum * levelNum / best
+
+
+
+if __name__ == '__main__':
+    rowNum = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    colNum = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    levelNum = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    genApproaches = sys.argv[4:] if len(sys.argv) > 4 else ['recur', 'fastRecur']
+
+    print(f'{rowNum}x{colNum}x{levelNum} maze')
+    print(f'{"generator":<12} {"AdjListGraph (cells/s)":>24} {"GridGraph (cells/s)":>22}')
+    for genApproach in genApproaches:
+        adjList = benchmark(genApproach, rowNum, colNum, levelNum)
+        grid = benchmark(genApproach, rowNum, colNum, levelNum, GridGraph)
+        print(f'{genApproach:<12} {adjList:>24,.0f} {grid:>22,.0f}')
@@ -0,0 +1,241 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import io
+import os
+import random
+import time
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from maze.gridGraph import GridGraph
+from generation.kruskalGenerator import KruskalMazeGenerator, interiorEdges
+from solverSelector import SolverSelector
+
+
+
+def scoreMaze(solverName: str, maze: Maze3D, entranceIndex: int, seeds: Sequence[int])->float:
+    """
+    Scores a candidate maze by solving it.  Runs in the worker processes of AdversarialMazeSearch.  Anything the
+    solver prints is discarded, as some solvers report every solve.
+
+    @param solverName: Name of the solver, as passed to SolverSelector.construct().
+    @param maze: Candidate maze, with its entrances and exits carved.
+    @param entranceIndex: Index of the entrance the solver starts from, or None to call solveMaze(maze) as for Task C.
+    @param seeds: Seeds for the random module, the solver is run once with each.
+
+    @returns Mean number of cells explored by the solver.
+    """
+    total = 0
+    for seed in seeds:
+        random.seed(seed)
+        solver = SolverSelector().construct(solverName)
+        with redirect_stdout(io.StringIO()):
+            if entranceIndex is None:
+                solver.solveMaze(maze)
+            else:
+                solver.solveMaze(maze, maze.getEntrances()[entranceIndex])
+        total += solver.getCellsExplored()
+
+    return total / len(seeds)
+
+
+
+class AdversarialMazeSearch:
+    """
+    Searches for a perfect maze that makes a solver explore as many cells as possible.
+
+    Candidates are spanning trees of the interior cells, mutated by removing a random passage, which splits the tree in
+    two, and opening a random wall between the two parts instead, so every candidate is still a perfect maze.  Each
+    round, a batch of mutants of the best maze so far is scored by running the solver on them in a pool of worker
+    processes, and the best mutant replaces the best maze if it scores at least as high (ties are accepted to drift
+    across plateaus).  The search stops when the time or evaluation budget runs out.
+    """
+
+    # Options accepted by the constructor, and their defaults.
+    DEFAULT_OPTIONS = {'timeBudget': 10.0, 'evalBudget': None, 'workers': None, 'batchSize': None,
+                       'solverRuns': 1, 'entranceIndex': None}
+
+    def __init__(self, solverName: str, options: dict = None):
+        """
+        Constructor.
+
+        @param solverName: Name of the solver to maximise the cells explored of, as passed to SolverSelector.construct().
+        @param options: Dictionary of search options, any of: 'timeBudget', seconds to search for (default 10, None for
+            no limit); 'evalBudget', number of candidates to score (default None, no limit); 'workers', number of
+            worker processes (default None, one per CPU, 1 scores in this process); 'batchSize', candidates per round
+            (default twice the workers); 'solverRuns', runs of the solver per candidate with different seeds, as
+            solvers may be randomised (default 1); 'entranceIndex', entrance the solver starts from, as
+            solverEntranceIndex of the configuration (default None, solving as for Task C).
+        """
+        options = dict(options) if options is not None else dict()
+        for name in options:
+            if name not in AdversarialMazeSearch.DEFAULT_OPTIONS:
+                raise ValueError('{} is an unknown adversarial search option.'.format(name))
+        options = {**AdversarialMazeSearch.DEFAULT_OPTIONS, **options}
+        if options['timeBudget'] is None and options['evalBudget'] is None:
+            raise ValueError('Adversarial search needs a time or evaluation budget.')
+
+        self.m_solverName: str = solverName
+        self.m_options: dict = options
+
+        # statistics of the last search
+        self.m_evalNum: int = 0
+        self.m_searchTime: float = 0
+        self.m_bestScore: float = 0
+
+
+
+    def search(self, maze: Maze3D):
+        """
+        Improves a maze in place.  The maze's interior passages are the starting candidate if they form a spanning
+        tree, otherwise a random (Kruskal) maze is.  The entrances and exits are stored but left uncarved.
+        Afterwards random is seeded with the first seed the candidates were solved with, so a solver run straight
+        after generation, as in mazeTester2.py, makes the same choices it made in the search.
+
+        @param maze: Maze to improve, with its entrances and exits stored.
+        """
+        options = self.m_options
+        workerNum = options['workers']
+        batchSize = options['batchSize'] or 2 * (workerNum if workerNum is not None else os.cpu_count() or 1)
+        # same solver seeds for every candidate, so they are compared on the same solver choices
+        seeds = [random.getrandbits(63) for _ in range(0, options['solverRuns'])]
+
+        (firstIds, secondIds) = interiorEdges(maze)
+        (firstIds, secondIds) = (firstIds.astype(np.int64), secondIds.astype(np.int64))
+        cellNum = maze.interiorCellNum()
+        # (index in firstIds/secondIds, neighbour) of the edges of each cell
+        cellEdges: List[List[Tuple[int, int]]] = [list() for _ in range(0, cellNum)]
+        for edge, (cell1, cell2) in enumerate(zip(firstIds.tolist(), secondIds.tolist())):
+            cellEdges[cell1].append((edge, cell2))
+            cellEdges[cell2].append((edge, cell1))
+
+        carved = ~np.asarray(maze.hasWalls(np.stack([firstIds, secondIds], axis=1)), dtype=bool)
+        if not self._isSpanningTree(carved, cellEdges):
+            maze.initCells(addWallFlag=True)
+            KruskalMazeGenerator().carve(maze)
+            carved = ~np.asarray(maze.hasWalls(np.stack([firstIds, secondIds], axis=1)), dtype=bool)
+
+        entranceIndex = options['entranceIndex']
+        candidate = lambda mask: self._candidateMaze(maze, firstIds[mask], secondIds[mask])
+        evaluate = lambda masks: [scoreMaze(self.m_solverName, candidate(mask), entranceIndex, seeds) for mask in masks]
+
+        startTime = time.perf_counter()
+        executor = ProcessPoolExecutor(max_workers=workerNum) if workerNum != 1 else None
+        # the solvers reseed random, restore its state afterwards
+        randomState = random.getstate()
+        try:
+            if executor is not None:
+                evaluate = lambda masks: list(executor.map(scoreMaze, [self.m_solverName] * len(masks),
+                                                           [candidate(mask) for mask in masks],
+                                                           [entranceIndex] * len(masks), [seeds] * len(masks)))
+
+            bestScore = evaluate([carved])[0]
+            evalNum = 1
+            while not self._budgetSpent(evalNum, time.perf_counter() - startTime):
+                random.setstate(randomState)
+                mutants = [self._mutate(carved, firstIds, secondIds, cellEdges) for _ in range(0, batchSize)]
+                randomState = random.getstate()
+
+                scores = evaluate(mutants)
+                evalNum += len(mutants)
+                best = int(np.argmax(scores))
+                if scores[best] >= bestScore:
+                    (carved, bestScore) = (mutants[best], scores[best])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        random.seed(seeds[0])
+
+        self.m_evalNum = evalNum
+        self.m_searchTime = time.perf_counter() - startTime
+        self.m_bestScore = bestScore
+
+        maze.initCells(addWallFlag=True)
+        maze.removeWalls(np.stack([firstIds[carved], secondIds[carved]], axis=1))
+
+
+
+    def evalRate(self)->float:
+        """
+        @returns Evaluations per second of the last search.
+        """
+        return self.m_evalNum / self.m_searchTime if self.m_searchTime > 0 else 0.0
+
+
+
+    def _budgetSpent(self, evalNum: int, elapsed: float)->bool:
+        timeBudget = self.m_options['timeBudget']
+        evalBudget = self.m_options['evalBudget']
+        return (timeBudget is not None and elapsed >= timeBudget) or (evalBudget is not None and evalNum >= evalBudget)
+
+
+
+    def _candidateMaze(self, maze: Maze3D, firstIds: np.ndarray, secondIds: np.ndarray)->Maze3D:
+        """
+        @returns A GridGraph backed copy of the maze's dimensions, entrances and exits (carved), with passages between
+            the given pairs of cells only.
+        """
+        candidate = Maze3D(maze.m_levelDims, GridGraph())
+        for entrance in maze.getEntrances():
+            candidate.storeEntrance(entrance)
+        for exit in maze.getExits():
+            candidate.storeExit(exit)
+        candidate.initCells(addWallFlag=True)
+        candidate.removeWalls(np.stack([firstIds, secondIds], axis=1))
+        candidate.carveEntrances()
+        candidate.carveExits()
+        return candidate
+
+
+
+    def _component(self, carved: np.ndarray, cellEdges: List[List[Tuple[int, int]]], start: int)->bytearray:
+        """
+        @returns Flags of the cells connected to start through carved edges.
+        """
+        carved = carved.tolist()
+        reached = bytearray(len(cellEdges))
+        reached[start] = 1
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for (edge, neigh) in cellEdges[cell]:
+                if carved[edge]:
+                    if not reached[neigh]:
+                        reached[neigh] = 1
+                        queue.append(neigh)
+
+        return reached
+
+
+
+    def _isSpanningTree(self, carved: np.ndarray, cellEdges: List[List[Tuple[int, int]]])->bool:
+        cellNum = len(cellEdges)
+        if int(carved.sum()) != cellNum - 1:
+            return False
+        return cellNum == 0 or all(self._component(carved, cellEdges, 0))
+
+
+
+    def _mutate(self, carved: np.ndarray, firstIds: np.ndarray, secondIds: np.ndarray,
+                cellEdges: List[List[Tuple[int, int]]])->np.ndarray:
+        """
+        @returns Copy of the spanning tree with one random passage closed and a random wall reconnecting the two parts
+            opened instead.
+        """
+        carvedEdges = np.flatnonzero(carved)
+        mutant = carved.copy()
+        if len(carvedEdges) == 0:
+            return mutant
+
+        removed = int(carvedEdges[random.randrange(len(carvedEdges))])
+        mutant[removed] = False
+        side = np.frombuffer(self._component(mutant, cellEdges, int(firstIds[removed])),
+                             dtype=np.uint8).astype(bool)
+        # walls between the two parts, the removed passage is one of them
+        crossing = np.flatnonzero((side[firstIds] != side[secondIds]) & ~mutant)
+        mutant[int(crossing[random.randrange(len(crossing))])] = True
+
+        return mutant
@@ -0,0 +1,44 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from generation.vectorMazeGenerator import VectorMazeGenerator
+
+
+class BinaryTreeMazeGenerator(VectorMazeGenerator):
+    """
+    Binary tree maze generator, extended to 3D.
+
+    Every cell carves a passage to one of its neighbours south (row-1), west (col-1) or on the level below, chosen
+    uniformly among those it has.  Each passage leads to a cell earlier in (level, row, col) order, and every cell but
+    (0, 0, 0) has at least one of them, as (0, 0) is on every level, so the passages form a spanning tree.  The choices
+    are independent, so a whole level is one random draw and a few array operations.
+
+    The mazes have a strong diagonal bias, with open corridors along the first row and column of level 0.
+    """
+
+    def carveLevel(self, rng: np.random.Generator, level: int, rowNum: int, colNum: int,
+                   lowerDims: Optional[Tuple[int, int]])->Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        rows = np.arange(0, rowNum).reshape(-1, 1)
+        cols = np.arange(0, colNum).reshape(1, -1)
+
+        # available directions of each cell
+        south = np.broadcast_to(rows > 0, (rowNum, colNum))
+        west = np.broadcast_to(cols > 0, (rowNum, colNum))
+        if lowerDims is not None:
+            down = (rows < lowerDims[0]) & (cols < lowerDims[1])
+        else:
+            down = np.zeros((rowNum, colNum), dtype=bool)
+
+        # pick one of them: the index of the pick among the available directions, in south, west, down order
+        available = south.astype(np.uint8) + west + down
+        pick = (rng.random((rowNum, colNum), dtype=np.float32) * available).astype(np.uint8)
+        goSouth = south & (pick == 0)
+        goWest = west & (pick == south)
+        goDown = down & (pick == south.astype(np.uint8) + west)
+
+        downOpen = None
+        if lowerDims is not None:
+            downOpen = goDown[:min(rowNum, lowerDims[0]), :min(colNum, lowerDims[1])]
+
+        return (goWest[:, 1:], goSouth[1:, :], downOpen)
@@ -0,0 +1,180 @@
+import random
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from maze.util import Coordinates3D
+from maze.mazeStream import MazeStreamWriter
+from generation.mazeGenerator import MazeGenerator
+
+
+# Translation table turning passages (1 where open) into walls (1 where closed), and back.
+FLIP_TABLE = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+
+
+class EllerMazeGenerator(MazeGenerator):
+    """
+    Eller's algorithm maze generator, for mazes too large to hold in memory.
+
+    Each level is generated row by row, only keeping the set label of each cell of the current row: adjacent cells
+    of different sets are joined at random, then every set carries on to the next row through at least one cell.  The
+    last row joins all remaining sets, which makes each level a spanning tree.  The levels are generated one after the
+    other, and joined by a single vertical passage between each pair of adjacent levels, at a random cell both levels
+    have, which keeps the whole maze perfect.  Keeping the sets of a whole level to join levels in more places would
+    make memory depend on the number of rows.
+
+    The carved passages are passed to callbacks row by row (see generateRows()), which write them straight into a
+    Maze3D (generateMaze()) or a streaming maze file (generateToStream()).
+    """
+
+    def __init__(self, joinProbability: float = 0.5):
+        """
+        Constructor.
+
+        @param joinProbability: Probability of joining two adjacent cells of different sets in a row, and of a cell
+            carrying its set down to the next row (one cell per set always does).  Default is 0.5.
+        """
+        super().__init__()
+        self.m_joinProbability: float = joinProbability
+
+
+
+    def generateMaze(self, maze: Maze3D):
+        # Initialize the maze with all walls
+        maze.initCells(addWallFlag=True)
+
+        def carveRow(level: int, row: int, colPassages: bytearray, rowPassages: bytearray):
+            # ids of the cells of the row, those of the next row are colNum further
+            colNum = maze.colNum(level)
+            ids = np.arange(0, colNum, dtype=np.int64) + maze.m_levelOffsets[level] + row * colNum
+            colOpen = np.frombuffer(colPassages, dtype=np.uint8) == 1
+            rowOpen = np.frombuffer(rowPassages, dtype=np.uint8) == 1
+            maze.removeWalls(np.concatenate([np.stack([ids[:-1][colOpen], ids[1:][colOpen]], axis=1),
+                                             np.stack([ids[rowOpen], ids[rowOpen] + colNum], axis=1)]))
+
+        def carvePassage(level: int, row: int, col: int):
+            if level < maze.levelNum() - 1:
+                maze.removeWall(Coordinates3D(level, row, col), Coordinates3D(level + 1, row, col))
+
+        self.generateRows(maze.m_levelDims, carveRow, carvePassage)
+        self.m_mazeGenerated = True
+
+
+
+    def generateToStream(self, path: str, levelDims: List[Tuple[int, int]], entrances: List[Coordinates3D],
+                         exits: List[Coordinates3D], compressLevel: int = 6):
+        """
+        Generates a maze straight into a streaming maze file (see maze/mazeStream.py), without building a Maze3D.
+        Only one row of walls is held in memory at a time.  As with Maze3D.save(), the entrances and exits are stored
+        but not carved.
+
+        @param path: Path of the file to write.
+        @param levelDims: (rowNum, colNum) of each level.
+        @param entrances: Entrances of the maze.
+        @param exits: Exits of the maze.
+        @param compressLevel: zlib compression level.  Default is 6.
+        """
+        levelNum = len(levelDims)
+
+        with open(path, 'wb') as stream:
+            writer = MazeStreamWriter(stream, levelDims, entrances, exits, compressLevel)
+
+            def writeRow(level: int, row: int, colPassages: bytearray, rowPassages: bytearray):
+                colNum = levelDims[level][1]
+                if row == 0:
+                    # walls below row 0
+                    writer.beginLevel(level)
+                    writer.writeLevelData(b'\x01' * colNum)
+                # walls between the columns of the row, boundaries included, then between the row and the next
+                writer.writeLevelData(b'\x01' + colPassages.translate(FLIP_TABLE) + b'\x01' +
+                                      rowPassages.translate(FLIP_TABLE))
+
+            def writePassage(level: int, passageRow: int, passageCol: int):
+                # walls between the level and the one above, wherever either level has a cell
+                if level < levelNum - 1:
+                    ((rowNum, colNum), (upperRowNum, upperColNum)) = (levelDims[level], levelDims[level + 1])
+                    for row in range(0, max(rowNum, upperRowNum)):
+                        walls = bytearray(max(colNum, upperColNum))
+                        if row < rowNum:
+                            walls[:colNum] = b'\x01' * colNum
+                        if row < upperRowNum:
+                            walls[:upperColNum] = b'\x01' * upperColNum
+                        if row == passageRow:
+                            walls[passageCol] = 0
+                        writer.writeLevelData(walls)
+                writer.endLevel()
+
+            self.generateRows(levelDims, writeRow, writePassage)
+
+        self.m_mazeGenerated = True
+
+
+
+    def generateRows(self, levelDims: List[Tuple[int, int]], rowCallback: Callable, passageCallback: Callable):
+        """
+        Runs Eller's algorithm, passing the carved passages to callbacks as they are decided.
+
+        @param levelDims: (rowNum, colNum) of each level.
+        @param rowCallback: Called once per row, in order, as rowCallback(level, row, colPassages, rowPassages):
+            colPassages[c] is 1 if the passage between columns c and c+1 of the row is open, rowPassages[c] is 1 if the
+            passage between column c of the row and the next row is open (always 0 for the last row).
+        @param passageCallback: Called after the last row of each level as passageCallback(level, row, col), with the
+            vertical passage between (level, row, col) and (level+1, row, col).  The top level has no passage, and
+            gets (level, -1, -1).
+        """
+        levelNum = len(levelDims)
+        joinProbability = self.m_joinProbability
+        rand = random.random
+
+        for level, (rowNum, colNum) in enumerate(levelDims):
+            # cell of the vertical passage to the level above, chosen before the level so memory stays constant
+            if level < levelNum - 1:
+                passage = (random.randrange(min(rowNum, levelDims[level + 1][0])),
+                           random.randrange(min(colNum, levelDims[level + 1][1])))
+            else:
+                passage = (-1, -1)
+
+            # set label of each cell of the current row, and the columns in each set
+            labels: List[int] = list(range(0, colNum))
+            members: dict = {col: [col] for col in range(0, colNum)}
+            nextLabel = colNum
+
+            for row in range(0, rowNum):
+                lastRow = row == rowNum - 1
+
+                # join adjacent cells of different sets, all of them on the last row
+                colPassages = bytearray(max(0, colNum - 1))
+                for col in range(0, colNum - 1):
+                    (label1, label2) = (labels[col], labels[col + 1])
+                    if label1 != label2 and (lastRow or rand() < joinProbability):
+                        colPassages[col] = 1
+                        # merge the smaller set into the larger one
+                        if len(members[label1]) < len(members[label2]):
+                            (label1, label2) = (label2, label1)
+                        for member in members[label2]:
+                            labels[member] = label1
+                        members[label1].extend(members.pop(label2))
+
+                # carry every set down to the next row through at least one of its cells
+                rowPassages = bytearray(colNum)
+                if not lastRow:
+                    for cols in members.values():
+                        carried = [col for col in cols if rand() < joinProbability]
+                        if not carried:
+                            carried = [random.choice(cols)]
+                        for col in carried:
+                            rowPassages[col] = 1
+
+                rowCallback(level, row, colPassages, rowPassages)
+
+                # cells not carried down start new sets
+                if not lastRow:
+                    members = dict()
+                    for col in range(0, colNum):
+                        if not rowPassages[col]:
+                            labels[col] = nextLabel
+                            nextLabel += 1
+                        members.setdefault(labels[col], list()).append(col)
+
+            passageCallback(level, *passage)
@@ -0,0 +1,73 @@
+from array import array
+import random
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from generation.mazeGenerator import MazeGenerator
+
+
+class FastRecurBackMazeGenerator(MazeGenerator):
+    """
+    Recursive backtracking maze generator working on integer cell ids.  Same algorithm as RecurBackMazeGenerator,
+    but the neighbours of each cell are looked up in the maze's neighbour table, visited cells are flagged in a
+    bytearray and the stack is an array of ids, so no objects are created while walking.  The walls are removed in
+    one batch at the end.
+    """
+
+    def generateMaze(self, maze: Maze3D):
+        # make sure we start the maze with all walls there
+        maze.initCells(True)
+
+        cellNum = maze.interiorCellNum()
+        (neighbourTable, degrees) = maze.idNeighbourTable()
+        directionNum = Maze3D.WALL_DIRECTION_NUM
+        rand = random.random
+
+        # select starting cell
+        startId = random.randrange(cellNum)
+
+        # run recursive backtracking/DFS from starting cell
+        stack = array('q', [startId])
+        visited = bytearray(cellNum)
+        visited[startId] = 1
+        carvedFirst = array('q')
+        carvedSecond = array('q')
+
+        while stack:
+            currId = stack[-1]
+            start = currId * directionNum
+            end = start + degrees[currId]
+
+            # count the unvisited neighbours
+            nonVisitedNum = 0
+            for k in range(start, end):
+                if not visited[neighbourTable[k]]:
+                    nonVisitedNum += 1
+
+            if nonVisitedNum == 0:
+                # backtrack
+                stack.pop()
+                continue
+
+            # randomly select one of them
+            pick = int(rand() * nonVisitedNum)
+            for k in range(start, end):
+                neighId = neighbourTable[k]
+                if not visited[neighId]:
+                    if pick == 0:
+                        break
+                    pick -= 1
+
+            # we move there and knock down wall, add to stack and update visited
+            carvedFirst.append(currId)
+            carvedSecond.append(neighId)
+            stack.append(neighId)
+            visited[neighId] = 1
+
+        if carvedFirst:
+            maze.removeWalls(np.stack([np.frombuffer(carvedFirst, dtype=np.int64),
+                                       np.frombuffer(carvedSecond, dtype=np.int64)], axis=1))
+
+        # update maze generated
+        self.m_mazeGenerated = True
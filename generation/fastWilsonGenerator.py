@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from generation.mazeGenerator import MazeGenerator
+from generation.indexedFrontier import IndexedFrontier
+
+
+class FastWilsonMazeGenerator(MazeGenerator):
+    """
+    Wilson's algorithm maze generator for 3D mazes, working on integer cell ids.
+
+    Same algorithm as WilsonMazeGenerator, so it also samples uniform spanning trees, but each random walk only
+    records the direction it last left every cell by.  Following those directions from the start of the walk retraces
+    it with all loops erased, so no path has to be stored or cut.  Unfinalised cells are kept in an indexed pool for
+    constant time random selection, and the neighbours of each cell are looked up in the maze's neighbour table.
+    """
+
+    def generateMaze(self, maze: Maze3D):
+        # Initialize the maze with all walls
+        maze.initCells(addWallFlag=True)
+
+        cellNum = maze.interiorCellNum()
+        (neighbourTable, degrees) = maze.idNeighbourTable()
+        directionNum = Maze3D.WALL_DIRECTION_NUM
+        rand = random.random
+
+        # Finalized cells, and the direction each cell was last left by in the current walk
+        finalized = bytearray(cellNum)
+        exitDirections = bytearray(cellNum)
+
+        # Pool of unfinalized cells
+        unfinalized = IndexedFrontier()
+        for cellId in range(0, cellNum):
+            unfinalized.add(cellId)
+
+        # Start with a random cell
+        startId = unfinalized.randomItem()
+        unfinalized.remove(startId)
+        finalized[startId] = 1
+
+        carved = list()
+        while unfinalized:
+            # Random walk from a random unfinalized cell until we hit a finalized cell, overwriting the exit
+            # direction of cells visited again, which erases the loops
+            walkStart = unfinalized.randomItem()
+            cellId = walkStart
+            while not finalized[cellId]:
+                direction = int(rand() * degrees[cellId])
+                exitDirections[cellId] = direction
+                cellId = neighbourTable[cellId * directionNum + direction]
+
+            # Carve the loop-erased path by following the exit directions from the start
+            cellId = walkStart
+            while not finalized[cellId]:
+                nextId = neighbourTable[cellId * directionNum + exitDirections[cellId]]
+                carved.append((cellId, nextId))
+                finalized[cellId] = 1
+                unfinalized.remove(cellId)
+                cellId = nextId
+
+        if carved:
+            maze.removeWalls(np.array(carved, dtype=np.int64))
+
+        # Set the mazeGenerated flag to True
+        self.m_mazeGenerated = True
@@ -0,0 +1,210 @@
+from array import array
+import random
+from typing import Dict, Union
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from generation.mazeGenerator import MazeGenerator
+
+
+# Cell selection policies of the growing tree generator.
+GROWING_TREE_POLICIES = ('newest', 'oldest', 'random')
+
+
+
+class ActiveCellSet:
+    """
+    Active cells of the growing tree generator, as cell ids.  The cells are kept both in the order they were added
+    (a doubly linked list over flat arrays), for the newest and oldest cells, and in an array with a position map,
+    for uniformly random ones.  Adding, removing and all three picks take constant time.
+    """
+
+    def __init__(self, cellNum: int):
+        """
+        Constructor.
+
+        @param cellNum: Number of cells of the maze, cell ids are from 0 to cellNum-1.
+        """
+        # previous/next (older/newer) active cell of each active cell, -1 if none
+        self.m_older = array('q', [-1]) * cellNum
+        self.m_newer = array('q', [-1]) * cellNum
+        self.m_oldest: int = -1
+        self.m_newest: int = -1
+
+        # active cells in no particular order, and the position of each in it
+        self.m_cells = array('q')
+        self.m_positions = array('q', [-1]) * cellNum
+
+
+
+    def add(self, cellId: int):
+        """
+        Adds a cell, which must not be active, as the newest cell.
+        """
+        self.m_older[cellId] = self.m_newest
+        self.m_newer[cellId] = -1
+        if self.m_newest >= 0:
+            self.m_newer[self.m_newest] = cellId
+        else:
+            self.m_oldest = cellId
+        self.m_newest = cellId
+
+        self.m_positions[cellId] = len(self.m_cells)
+        self.m_cells.append(cellId)
+
+
+
+    def remove(self, cellId: int):
+        """
+        Removes an active cell.
+        """
+        (older, newer) = (self.m_older[cellId], self.m_newer[cellId])
+        if older >= 0:
+            self.m_newer[older] = newer
+        else:
+            self.m_oldest = newer
+        if newer >= 0:
+            self.m_older[newer] = older
+        else:
+            self.m_newest = older
+
+        # move the last cell into the freed position
+        position = self.m_positions[cellId]
+        lastCellId = self.m_cells.pop()
+        if lastCellId != cellId:
+            self.m_cells[position] = lastCellId
+            self.m_positions[lastCellId] = position
+        self.m_positions[cellId] = -1
+
+
+
+    def newest(self)->int:
+        return self.m_newest
+
+
+
+    def oldest(self)->int:
+        return self.m_oldest
+
+
+
+    def randomCell(self)->int:
+        """
+        @returns An active cell chosen uniformly at random, using the random module.
+        """
+        return self.m_cells[random.randrange(len(self.m_cells))]
+
+
+
+    def __len__(self)->int:
+        return len(self.m_cells)
+
+
+
+class GrowingTreeMazeGenerator(MazeGenerator):
+    """
+    Growing tree maze generator for 3D mazes.
+
+    Keeps a set of active cells, starting with a random one.  At each step a cell is selected from the active set by
+    the policy, and a wall to a random unvisited neighbour is knocked down, making that neighbour active; cells
+    without unvisited neighbours leave the set.  Selecting the newest cell behaves like the recursive backtracker
+    (long winding corridors), a random cell like Prim's algorithm (short branching corridors), and the oldest cell
+    gives long straight corridors.  A weighted mix of policies blends these textures.
+    """
+
+    def __init__(self, policy: Union[str, Dict[str, float]] = 'newest'):
+        """
+        Constructor.
+
+        @param policy: Cell selection policy: 'newest', 'oldest' or 'random', or a dictionary of these policies to
+            their weights, e.g., {"newest": 0.75, "random": 0.25}, to pick the policy at random at each step.
+            Default is 'newest'.
+        """
+        super().__init__()
+
+        weights = {policy: 1.0} if isinstance(policy, str) else dict(policy)
+        for (name, weight) in weights.items():
+            if name not in GROWING_TREE_POLICIES:
+                raise ValueError('{} is an unknown growing tree policy.'.format(name))
+            if weight < 0:
+                raise ValueError('Weight of growing tree policy {} is negative.'.format(name))
+        if sum(weights.values()) <= 0:
+            raise ValueError('Growing tree policy weights sum to zero.')
+
+        # cumulative weights of each policy, normalised to 1, in the order of GROWING_TREE_POLICIES
+        total = sum(weights.values())
+        self.m_cumulativeWeights = list(np.cumsum([weights.get(name, 0) / total for name in GROWING_TREE_POLICIES]))
+        # index in GROWING_TREE_POLICIES of the only policy with a weight, or -1 for a mix
+        usedPolicies = [index for (index, name) in enumerate(GROWING_TREE_POLICIES) if weights.get(name, 0) > 0]
+        self.m_policyIndex: int = usedPolicies[0] if len(usedPolicies) == 1 else -1
+
+
+
+    def generateMaze(self, maze: Maze3D):
+        # Initialize the maze with all walls
+        maze.initCells(addWallFlag=True)
+
+        cellNum = maze.interiorCellNum()
+        (neighbourTable, degrees) = maze.idNeighbourTable()
+        directionNum = Maze3D.WALL_DIRECTION_NUM
+        rand = random.random
+        (newestWeight, oldestWeight, _) = self.m_cumulativeWeights
+        policyIndex = self.m_policyIndex
+
+        # Start from a random cell
+        startId = random.randrange(cellNum)
+        visited = bytearray(cellNum)
+        visited[startId] = 1
+        active = ActiveCellSet(cellNum)
+        active.add(startId)
+        carvedFirst = array('q')
+        carvedSecond = array('q')
+
+        while active:
+            # select a cell according to the policy, drawn at random for a mix
+            if policyIndex < 0:
+                draw = rand()
+                policy = 0 if draw < newestWeight else (1 if draw < oldestWeight else 2)
+            else:
+                policy = policyIndex
+
+            if policy == 0:
+                currId = active.newest()
+            elif policy == 1:
+                currId = active.oldest()
+            else:
+                currId = active.randomCell()
+
+            start = currId * directionNum
+            end = start + degrees[currId]
+
+            # count the unvisited neighbours, a cell without any leaves the active set
+            nonVisitedNum = 0
+            for k in range(start, end):
+                if not visited[neighbourTable[k]]:
+                    nonVisitedNum += 1
+            if nonVisitedNum == 0:
+                active.remove(currId)
+                continue
+
+            # randomly select one of them, knock down the wall and make it active
+            pick = int(rand() * nonVisitedNum)
+            for k in range(start, end):
+                neighId = neighbourTable[k]
+                if not visited[neighId]:
+                    if pick == 0:
+                        break
+                    pick -= 1
+
+            carvedFirst.append(currId)
+            carvedSecond.append(neighId)
+            visited[neighId] = 1
+            active.add(neighId)
+
+        if carvedFirst:
+            maze.removeWalls(np.stack([np.frombuffer(carvedFirst, dtype=np.int64),
+                                       np.frombuffer(carvedSecond, dtype=np.int64)], axis=1))
+
+        # Set the mazeGenerated flag to True
+        self.m_mazeGenerated = True
@@ -0,0 +1,87 @@
+import random
+from typing import Any, Hashable, List
+
+
+
+class IndexedFrontier:
+    """
+    Set of items with a value attached to each, supporting insertion, removal and uniformly random selection in
+    constant time.  The items are kept in an array, with a map from each item to its position; an item is removed by
+    moving the last item into its place.  Used for the frontiers and pools of cells of the generators, which would
+    otherwise have to copy a whole set to pick a random member.
+    """
+
+    def __init__(self):
+        # self.m_items: the items, in no particular order.  self.m_values: the value of each item, same order.
+        self.m_items: List[Hashable] = list()
+        self.m_values: List[Any] = list()
+        # self.m_positions: position of each item in m_items.
+        self.m_positions: dict = dict()
+
+
+
+    def add(self, item: Hashable, value: Any = None)->bool:
+        """
+        Adds an item, if not already there.
+
+        @param item: Item to add.
+        @param value: Value attached to the item.  Default is None.
+
+        @returns True if the item was added, False if it was already there (its value is left unchanged).
+        """
+        if item in self.m_positions:
+            return False
+
+        self.m_positions[item] = len(self.m_items)
+        self.m_items.append(item)
+        self.m_values.append(value)
+        return True
+
+
+
+    def remove(self, item: Hashable)->Any:
+        """
+        Removes an item, which must be there.
+
+        @param item: Item to remove.
+
+        @returns The value that was attached to the item.
+        """
+        position = self.m_positions.pop(item)
+        value = self.m_values[position]
+
+        # move the last item into the freed position
+        lastItem = self.m_items.pop()
+        lastValue = self.m_values.pop()
+        if position < len(self.m_items):
+            self.m_items[position] = lastItem
+            self.m_values[position] = lastValue
+            self.m_positions[lastItem] = position
+
+        return value
+
+
+
+    def randomItem(self)->Hashable:
+        """
+        @returns An item chosen uniformly at random, using the random module.  The frontier must not be empty.
+        """
+        return self.m_items[random.randrange(len(self.m_items))]
+
+
+
+    def value(self, item: Hashable)->Any:
+        """
+        @returns The value attached to item, which must be there.
+        """
+        return self.m_values[self.m_positions[item]]
+
+
+
+    def __contains__(self, item: Hashable)->bool:
+        return item in self.m_positions
+
+
+
+    def __len__(self)->int:
+        return len(self.m_items)
@@ -0,0 +1,131 @@
+from array import array
+import random
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from generation.mazeGenerator import MazeGenerator
+
+
+# Number of shuffled edges converted to Python ints at a time, which bounds the extra memory for huge mazes.
+EDGE_CHUNK_SIZE = 1 << 20
+
+
+
+def interiorEdges(maze: Maze3D)->tuple:
+    """
+    Lists the edges between adjacent interior cells of a maze, as cell ids.
+
+    @param maze: Maze to list the edges of.
+
+    @returns Tuple of two integer arrays (ids of the first cells, ids of the second cells), one entry per edge.
+    """
+    dtype = np.int32 if maze.interiorCellNum() < np.iinfo(np.int32).max else np.int64
+    firstIds = list()
+    secondIds = list()
+
+    levelIds = [np.arange(maze.m_levelOffsets[level], maze.m_levelOffsets[level + 1], dtype=dtype)
+                .reshape(maze.rowNum(level), maze.colNum(level)) for level in range(0, maze.levelNum())]
+
+    for level, ids in enumerate(levelIds):
+        # between rows, between columns
+        firstIds.extend([ids[:-1, :].ravel(), ids[:, :-1].ravel()])
+        secondIds.extend([ids[1:, :].ravel(), ids[:, 1:].ravel()])
+
+        # to the level above, where both levels have a cell
+        if level < maze.levelNum() - 1:
+            upperIds = levelIds[level + 1]
+            rowNum = min(ids.shape[0], upperIds.shape[0])
+            colNum = min(ids.shape[1], upperIds.shape[1])
+            firstIds.append(ids[:rowNum, :colNum].ravel())
+            secondIds.append(upperIds[:rowNum, :colNum].ravel())
+
+    return (np.concatenate(firstIds), np.concatenate(secondIds))
+
+
+
+class KruskalMazeGenerator(MazeGenerator):
+    """
+    Kruskal's algorithm maze generator for 3D mazes.
+
+    Every edge between interior cells is visited once in random order, and its wall removed if it joins two cells that
+    aren't connected yet.  Cells are handled as integer ids: the union-find forest is kept in flat arrays (parent and
+    rank) and the edges in a NumPy array shuffled in one go, so memory and time grow linearly with the number of cells.
+    """
+
+    def generateMaze(self, maze: Maze3D):
+        # Initialize the maze with all walls
+        maze.initCells(addWallFlag=True)
+
+        self.carve(maze)
+
+        self.m_mazeGenerated = True
+
+
+
+    def carve(self, maze: Maze3D):
+        """
+        Carves a spanning tree of the interior cells into a maze that has all its walls.
+
+        @param maze: Maze to carve, already initialised with all walls.
+        """
+        cellNum = maze.interiorCellNum()
+        if cellNum == 0:
+            return
+
+        # shuffle the edges, seeding NumPy from random so that random.seed() still gives reproducible mazes
+        (firstIds, secondIds) = interiorEdges(maze)
+        order = np.random.default_rng(random.getrandbits(63)).permutation(len(firstIds))
+        firstIds = firstIds[order]
+        secondIds = secondIds[order]
+        del order
+
+        # union-find forest, each cell starting as its own root
+        parent = array('q', range(0, cellNum))
+        rank = bytearray(cellNum)
+        carvedFirst = array('q')
+        carvedSecond = array('q')
+
+        # a spanning tree has one edge less than there are cells
+        remaining = cellNum - 1
+        for start in range(0, len(firstIds), EDGE_CHUNK_SIZE):
+            for (cell1, cell2) in zip(firstIds[start:start + EDGE_CHUNK_SIZE].tolist(),
+                                      secondIds[start:start + EDGE_CHUNK_SIZE].tolist()):
+                # find the roots, then compress the paths to them, iteratively
+                root1 = cell1
+                while parent[root1] != root1:
+                    root1 = parent[root1]
+                node = cell1
+                while parent[node] != root1:
+                    (parent[node], node) = (root1, parent[node])
+
+                root2 = cell2
+                while parent[root2] != root2:
+                    root2 = parent[root2]
+                node = cell2
+                while parent[node] != root2:
+                    (parent[node], node) = (root2, parent[node])
+
+                if root1 == root2:
+                    continue
+
+                # union by rank
+                if rank[root1] < rank[root2]:
+                    parent[root1] = root2
+                elif rank[root1] > rank[root2]:
+                    parent[root2] = root1
+                else:
+                    parent[root2] = root1
+                    rank[root1] += 1
+
+                carvedFirst.append(cell1)
+                carvedSecond.append(cell2)
+                remaining -= 1
+                if remaining == 0:
+                    break
+
+            if remaining == 0:
+                break
+
+        maze.removeWalls(np.stack([np.frombuffer(carvedFirst, dtype=np.int64),
+                                   np.frombuffer(carvedSecond, dtype=np.int64)], axis=1))
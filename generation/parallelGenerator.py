@@ -0,0 +1,111 @@
+from concurrent.futures import ProcessPoolExecutor
+import random
+from typing import Tuple
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from maze.gridGraph import GridGraph
+from generation.mazeGenerator import MazeGenerator
+
+
+
+def generateLevel(levelApproach: str, rowNum: int, colNum: int, seed: int)->Tuple[np.ndarray, np.ndarray]:
+    """
+    Generates a single level maze.  Runs in the worker processes of ParallelLevelMazeGenerator.
+
+    @param levelApproach: Name of the generator to use, as passed to GeneratorSelector.construct().
+    @param rowNum: Number of rows of the level.
+    @param colNum: Number of columns of the level.
+    @param seed: Seed for the random module.
+
+    @returns Tuple of the column and row wall arrays of the level, in the GridGraph layout.
+    """
+    # imported here, as the selector imports this module
+    from generatorSelector import GeneratorSelector
+
+    random.seed(seed)
+    levelMaze = Maze3D([(rowNum, colNum)], GridGraph())
+    GeneratorSelector().construct(levelApproach).generateMaze(levelMaze)
+
+    return (levelMaze.m_graph.m_colWalls[0].copy(), levelMaze.m_graph.m_rowWalls[0].copy())
+
+
+
+class ParallelLevelMazeGenerator(MazeGenerator):
+    """
+    Generates each level of a 3D maze as a separate 2D maze, in parallel in a pool of worker processes, with any of
+    the other generators.  The levels are then joined into one perfect maze by opening a single vertical passage
+    between each pair of adjacent levels, at a random cell that both levels have: a spanning tree on every level
+    plus one edge between consecutive levels is a spanning tree of the whole maze.
+
+    Note the resulting mazes have far fewer vertical passages than those generated over the whole maze at once.
+    """
+
+    # Selector names of the parallel generators, and the generator each uses for the levels.
+    APPROACHES = {'parallelPrim': 'prim', 'parallelWilson': 'fastWilson', 'parallelRecur': 'fastRecur'}
+
+    def __init__(self, levelApproach: str = 'prim', workerNum: int = None):
+        """
+        Constructor.
+
+        @param levelApproach: Name of the generator used for each level, as passed to GeneratorSelector.construct().
+            Default is 'prim'.
+        @param workerNum: Number of worker processes.  Default is None, which uses one per CPU.
+        """
+        super().__init__()
+        self.m_levelApproach: str = levelApproach
+        self.m_workerNum: int = workerNum
+
+
+
+    def generateMaze(self, maze: Maze3D):
+        # Initialize the maze with all walls
+        maze.initCells(addWallFlag=True)
+
+        levelNum = maze.levelNum()
+        rowNums = [maze.rowNum(level) for level in range(0, levelNum)]
+        colNums = [maze.colNum(level) for level in range(0, levelNum)]
+        # seeds of the levels and cells of the vertical passages, drawn from random up front, so that random.seed()
+        # still gives reproducible mazes however the levels are generated
+        seeds = [random.getrandbits(63) for _ in range(0, levelNum)]
+        passages = [(random.randrange(min(rowNums[level], rowNums[level + 1])),
+                     random.randrange(min(colNums[level], colNums[level + 1]))) for level in range(0, levelNum - 1)]
+
+        if levelNum == 1 or self.m_workerNum == 1:
+            # the levels reseed random, restore its state afterwards
+            randomState = random.getstate()
+            levelWalls = map(generateLevel, [self.m_levelApproach] * levelNum, rowNums, colNums, seeds)
+            self._carveLevels(maze, levelWalls)
+            random.setstate(randomState)
+        else:
+            with ProcessPoolExecutor(max_workers=self.m_workerNum) as executor:
+                levelWalls = executor.map(generateLevel, [self.m_levelApproach] * levelNum, rowNums, colNums, seeds)
+                self._carveLevels(maze, levelWalls)
+
+        # join the levels, with one passage between each level and the one above it
+        for level, (row, col) in enumerate(passages):
+            maze.removeWall(maze.coordOf(maze.m_levelOffsets[level] + row * colNums[level] + col),
+                            maze.coordOf(maze.m_levelOffsets[level + 1] + row * colNums[level + 1] + col))
+
+        self.m_mazeGenerated = True
+
+
+
+    def _carveLevels(self, maze: Maze3D, levelWalls):
+        """
+        Copies the passages of the generated levels into the maze, as each level becomes available.
+
+        @param maze: Maze to carve.
+        @param levelWalls: Iterable of the column and row wall arrays of each level, in order.
+        """
+        for level, (colWalls, rowWalls) in enumerate(levelWalls):
+            (rowNum, colNum) = (maze.rowNum(level), maze.colNum(level))
+            ids = np.arange(maze.m_levelOffsets[level], maze.m_levelOffsets[level + 1], dtype=np.int64).reshape(rowNum, colNum)
+
+            # passages between columns, then between rows, leaving the boundary walls alone
+            colOpen = colWalls[:, 1:colNum] == 0
+            rowOpen = rowWalls[1:rowNum, :] == 0
+            pairs = np.concatenate([np.stack([ids[:, :-1][colOpen], ids[:, 1:][colOpen]], axis=1),
+                                    np.stack([ids[:-1, :][rowOpen], ids[1:, :][rowOpen]], axis=1)])
+            maze.removeWalls(pairs)
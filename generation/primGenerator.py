@@ -1,6 +1,7 @@
 from maze.maze3D import Maze3D
 from maze.util import Coordinates3D
 from generation.mazeGenerator import MazeGenerator
+from generation.indexedFrontier import IndexedFrontier
 import random
 
 class PrimMazeGenerator(MazeGenerator):
@@ -15,10 +16,10 @@ class PrimMazeGenerator(MazeGenerator):
         # Dimensions of the maze
         num_levels = maze.levelNum()
         
-        # Set to track visited cells and dict for frontier cells
-        # frontier maps: cell -> neighboring visited cell that added it
+        # Set to track visited cells and indexed frontier of cells
+        # frontier maps: cell -> neighboring visited cell that added it, with O(1) random pick and removal
         visited = set()
-        frontier = {}  # Changed from list to dict
+        frontier = IndexedFrontier()
         
         # Get all valid cells
         all_cells = [Coordinates3D(l, r, c) 
@@ -37,15 +38,14 @@ class PrimMazeGenerator(MazeGenerator):
         
         while frontier:
             # Randomly select a cell from the frontier
-            current_cell = random.choice(list(frontier.keys()))
-            neighbor_that_added_it = frontier[current_cell]
+            current_cell = frontier.randomItem()
+            neighbor_that_added_it = frontier.remove(current_cell)
             
             # Remove wall between current cell and the neighbor that added it
             maze.removeWall(current_cell, neighbor_that_added_it)
             
             # Mark the current cell as visited
             visited.add(current_cell)
-            del frontier[current_cell]
             
             # Add the neighbors of the current cell to the frontier
             self._addNeighboursToFrontier(maze, current_cell, visited, frontier)
@@ -70,4 +70,4 @@ class PrimMazeGenerator(MazeGenerator):
                 0 <= col < maze.colNum(level) and
                 neighbour not in visited and 
                 neighbour not in frontier):
-                frontier[neighbour] = cell  # Track which visited cell added this frontier cell
\ No newline at end of file
+                frontier.add(neighbour, cell)  # Track which visited cell added this frontier cell
\ No newline at end of file
@@ -0,0 +1,72 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from generation.vectorMazeGenerator import VectorMazeGenerator
+
+
+class SidewinderMazeGenerator(VectorMazeGenerator):
+    """
+    Sidewinder maze generator, extended to 3D.
+
+    Each row is cut into runs of cells joined west to east, closing each run at random.  Every run then carves one
+    passage from a random cell of it, south (row-1) or down to the level below, whichever that cell has.  The first
+    row of level 0 is a single run with no passage out.  On the first row of the other levels, runs may only close
+    where the run has a cell above the level below, so each can carve down.  As every run but the first is joined to
+    an earlier row or level exactly once, the passages form a spanning tree.
+
+    The runs are found by run-length grouping of the close decisions of the whole level, so no loop over cells is
+    needed.
+    """
+
+    def __init__(self, closeProbability: float = 0.5):
+        """
+        Constructor.
+
+        @param closeProbability: Probability of closing the run at each cell.  Default is 0.5.
+        """
+        super().__init__()
+        self.m_closeProbability: float = closeProbability
+
+
+
+    def carveLevel(self, rng: np.random.Generator, level: int, rowNum: int, colNum: int,
+                   lowerDims: Optional[Tuple[int, int]])->Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        # whether the run is closed after each cell, always at the end of a row
+        closeRun = rng.random((rowNum, colNum), dtype=np.float32) < self.m_closeProbability
+        closeRun[:, -1] = True
+        if lowerDims is None:
+            closeRun[0, :-1] = False
+        else:
+            closeRun[0, lowerDims[1] - 1:-1] = False
+
+        # runs, in row order, as the flat indices of their first and last cells
+        ends = np.flatnonzero(closeRun)
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        # on the first row, pick among the cells that have a cell below
+        lasts = ends.copy()
+        if lowerDims is not None:
+            firstRow = ends < colNum
+            lasts[firstRow] = np.minimum(ends[firstRow], lowerDims[1] - 1)
+
+        # cell of each run carving out of it, and where to
+        picks = starts + (rng.random(len(ends)) * (lasts - starts + 1)).astype(np.int64)
+        (rows, cols) = np.divmod(picks, colNum)
+        canSouth = rows > 0
+        if lowerDims is not None:
+            canDown = (rows < lowerDims[0]) & (cols < lowerDims[1])
+        else:
+            canDown = np.zeros(len(ends), dtype=bool)
+        goDown = canDown & (~canSouth | (rng.random(len(ends)) < 0.5))
+        goSouth = canSouth & ~goDown
+
+        rowOpen = np.zeros((rowNum - 1, colNum), dtype=bool)
+        rowOpen[rows[goSouth] - 1, cols[goSouth]] = True
+        downOpen = None
+        if lowerDims is not None:
+            downOpen = np.zeros((min(rowNum, lowerDims[0]), min(colNum, lowerDims[1])), dtype=bool)
+            downOpen[rows[goDown], cols[goDown]] = True
+
+        return (~closeRun[:, :-1], rowOpen, downOpen)
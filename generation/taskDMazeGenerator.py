@@ -5,6 +5,8 @@ from typing import List, Tuple
 from maze.maze3D import Maze3D
 from maze.util import Coordinates3D
 from generation.mazeGenerator import MazeGenerator
+from generation.kruskalGenerator import KruskalMazeGenerator
+from generation.adversarialSearch import AdversarialMazeSearch
 import random
 
 DIRECTIONS = [
@@ -17,9 +19,15 @@ DIRECTIONS = [
 ]
 
 class TaskDMazeGenerator(MazeGenerator):
-    def __init__(self, solver_name: str):
+    def __init__(self, solver_name: str, searchOptions: dict = None):
+        """
+        @param solver_name: Name of the solver to generate a maze against.
+        @param searchOptions: Options of the adversarial search (see AdversarialMazeSearch), which then improves the
+            maze by scoring candidates with the solver.  Default is None, which only uses the heuristic for the solver.
+        """
         self.solver_name = solver_name
         self.m_mazeGenerated = False
+        self.m_search = AdversarialMazeSearch(solver_name, searchOptions) if searchOptions is not None else None
 
     def generateMaze(self, maze: Maze3D):
         maze.initCells(addWallFlag=True)
@@ -37,6 +45,9 @@ class TaskDMazeGenerator(MazeGenerator):
             self._generate_maze_for_taskC(maze)
             print(f"TaskC maze generator was used")
 
+        if self.m_search is not None:
+            self.m_search.search(maze)
+
         self._add_boundaries(maze)
         self.m_mazeGenerated = True
 
@@ -133,54 +144,7 @@ class TaskDMazeGenerator(MazeGenerator):
         """
         Generate a perfect maze using Kruskal's algorithm.
         """
-        edges = []
-        cells = maze.allCells()
-        parent = {cell: cell for cell in cells}
-
-        def find(cell):
-            if parent[cell] != cell:
-                parent[cell] = find(parent[cell])
-            return parent[cell]
-
-        def union(cell1, cell2):
-            root1 = find(cell1)
-            root2 = find(cell2)
-            if root1 != root2:
-                parent[root2] = root1
-
-        for cell in cells:
-            for neighbor in self._get_neighbors(maze, cell):
-                if maze.hasWall(cell, neighbor):
-                    edges.append((cell, neighbor))
-
-        random.shuffle(edges)
-
-        while edges:
-            cell1, cell2 = edges.pop()
-            if find(cell1) != find(cell2):
-                # Check if both cells are within boundaries
-                if not maze.checkCoordinates(cell1) or not maze.checkCoordinates(cell2):
-                    continue
-
-                # Check if removing the wall will not lead outside the maze boundaries
-                if not self._is_within_boundaries(maze, cell1, cell2):
-                    continue
-
-                maze.removeWall(cell1, cell2)
-                union(cell1, cell2)
-
-    def _is_within_boundaries(self, maze: Maze3D, cell1: Coordinates3D, cell2: Coordinates3D) -> bool:
-        """
-        Check if the passage between two cells is within the maze boundaries.
-        """
-        levels = maze.levelNum()
-        for cell in [cell1, cell2]:
-            if not (0 <= cell.getLevel() < levels):
-                return False
-            rows, cols = maze.rowNum(cell.getLevel()), maze.colNum(cell.getLevel())
-            if not (0 <= cell.getRow() < rows) or not (0 <= cell.getCol() < cols):
-                return False
-        return True
+        KruskalMazeGenerator().carve(maze)
 
     def _add_dead_ends(self, maze: Maze3D):
         levels = maze.levelNum()
@@ -213,11 +177,12 @@ class TaskDMazeGenerator(MazeGenerator):
                     neighbors.append(neighbor)
         return neighbors
 
-    def solveMaze(self, maze: Maze3D, mazeEntrances: List[Coordinates3D], solverEntIndex: int):
-        if self.solver_name == 'taskC':
-            solver.solveMaze(maze)
-        else:
-            solver.solveMaze(maze, mazeEntrances[solverEntIndex])
+    def getSearch(self) -> AdversarialMazeSearch:
+        """
+        @returns The adversarial search run after the heuristic, with the statistics of the last search, or None if
+            there is none.
+        """
+        return self.m_search
 
     def isMazeGenerated(self):
         return self.m_mazeGenerated
@@ -0,0 +1,85 @@
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+from maze.maze3D import Maze3D
+from maze.gridGraph import GridGraph
+from generation.mazeGenerator import MazeGenerator
+
+
+class VectorMazeGenerator(MazeGenerator):
+    """
+    Base class of the generators that carve each level with whole-array NumPy operations, with no loop over cells.
+    Subclasses decide the passages of one level at a time (see carveLevel()), as boolean arrays, which are written
+    straight into the wall arrays of a GridGraph, or removed as a batch of cell id pairs for the other graphs.
+
+    For throughput, use a GridGraph backed maze: carving then costs a few array operations per level.
+    """
+
+    def generateMaze(self, maze: Maze3D):
+        # Initialize the maze with all walls
+        maze.initCells(addWallFlag=True)
+        # level by level random numbers, seeded from random so that random.seed() still gives reproducible mazes
+        rng = np.random.default_rng(random.getrandbits(63))
+
+        graph = maze.m_graph
+        if isinstance(graph, GridGraph):
+            maze.buildAllLevels()
+
+        for level, (rowNum, colNum) in enumerate(maze.m_levelDims):
+            lowerDims = maze.m_levelDims[level - 1] if level > 0 else None
+            (colOpen, rowOpen, downOpen) = self.carveLevel(rng, level, rowNum, colNum, lowerDims)
+
+            if isinstance(graph, GridGraph):
+                graph.m_colWalls[level][:, 1:colNum][colOpen] = 0
+                graph.m_rowWalls[level][1:rowNum, :][rowOpen] = 0
+                if downOpen is not None:
+                    graph.m_levelWalls[level - 1][:downOpen.shape[0], :downOpen.shape[1]][downOpen] = 0
+            else:
+                maze.removeWalls(self._levelPairs(maze, level, colOpen, rowOpen, downOpen))
+
+        self.m_mazeGenerated = True
+
+
+
+    def carveLevel(self, rng: np.random.Generator, level: int, rowNum: int, colNum: int,
+                   lowerDims: Optional[Tuple[int, int]])->Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Decides the passages of a level.  The passages of all levels must together form a spanning tree of the maze.
+        Implemented by the subclasses.
+
+        @param rng: NumPy random generator to draw from.
+        @param level: Level to carve.
+        @param rowNum: Number of rows of the level.
+        @param colNum: Number of columns of the level.
+        @param lowerDims: (rowNum, colNum) of the level below, None for level 0.
+
+        @returns Tuple of boolean arrays: colOpen (rowNum, colNum-1), True where the passage between (row, col) and
+            (row, col+1) is open; rowOpen (rowNum-1, colNum), between (row, col) and (row+1, col); downOpen, over the
+            cells both the level and the one below have, between (level, row, col) and (level-1, row, col), or None
+            for level 0.
+        """
+        pass
+
+
+
+    def _levelPairs(self, maze: Maze3D, level: int, colOpen: np.ndarray, rowOpen: np.ndarray,
+                    downOpen: Optional[np.ndarray])->np.ndarray:
+        """
+        @returns Integer array of shape (n, 2) of the pairs of cell ids of the passages of a level.
+        """
+        (rowNum, colNum) = maze.m_levelDims[level]
+        ids = np.arange(maze.m_levelOffsets[level], maze.m_levelOffsets[level + 1], dtype=np.int64).reshape(rowNum, colNum)
+        pairs = [np.stack([ids[:, :-1][colOpen], ids[:, 1:][colOpen]], axis=1),
+                 np.stack([ids[:-1, :][rowOpen], ids[1:, :][rowOpen]], axis=1)]
+
+        if downOpen is not None:
+            (lowerRowNum, lowerColNum) = maze.m_levelDims[level - 1]
+            lowerIds = np.arange(maze.m_levelOffsets[level - 1], maze.m_levelOffsets[level],
+                                 dtype=np.int64).reshape(lowerRowNum, lowerColNum)
+            (overlapRowNum, overlapColNum) = downOpen.shape
+            pairs.append(np.stack([ids[:overlapRowNum, :overlapColNum][downOpen],
+                                   lowerIds[:overlapRowNum, :overlapColNum][downOpen]], axis=1))
+
+        return np.concatenate(pairs)
@@ -3,6 +3,14 @@ from generation.recurBackGenerator import RecurBackMazeGenerator
 from generation.primGenerator import PrimMazeGenerator
 from generation.wilsonGenerator import WilsonMazeGenerator
 from generation.taskDMazeGenerator import TaskDMazeGenerator
+from generation.kruskalGenerator import KruskalMazeGenerator
+from generation.fastWilsonGenerator import FastWilsonMazeGenerator
+from generation.fastRecurBackGenerator import FastRecurBackMazeGenerator
+from generation.parallelGenerator import ParallelLevelMazeGenerator
+from generation.ellerGenerator import EllerMazeGenerator
+from generation.growingTreeGenerator import GrowingTreeMazeGenerator
+from generation.binaryTreeGenerator import BinaryTreeMazeGenerator
+from generation.sidewinderGenerator import SidewinderMazeGenerator
 from solving.mazeSolver import MazeSolver
 
 
@@ -12,12 +20,14 @@ class GeneratorSelector:
     """
 
 
-    def construct(self, genApproach: str)->MazeGenerator:
+    def construct(self, genApproach: str, genPolicy=None)->MazeGenerator:
         """
         Tasks A, B and C, with a specified maze generator.
         If genApproach is unknown, None will be returned.
 
         @param genApproach: Name of generator to use.
+        @param genPolicy: Cell selection policy of the 'growing_tree' generator, a policy name or a dictionary of policy
+            names to weights (see GrowingTreeMazeGenerator).  Default is None, which selects the newest cell.
         
         @return: Instance of a maze generator.
         """
@@ -29,18 +39,36 @@ class GeneratorSelector:
             generator = PrimMazeGenerator()
         elif genApproach == 'wilson':
             generator = WilsonMazeGenerator()
+        elif genApproach == 'kruskal':
+            generator = KruskalMazeGenerator()
+        elif genApproach == 'fastWilson':
+            generator = FastWilsonMazeGenerator()
+        elif genApproach == 'fastRecur':
+            generator = FastRecurBackMazeGenerator()
+        elif genApproach in ParallelLevelMazeGenerator.APPROACHES:
+            generator = ParallelLevelMazeGenerator(ParallelLevelMazeGenerator.APPROACHES[genApproach])
+        elif genApproach == 'eller':
+            generator = EllerMazeGenerator()
+        elif genApproach == 'growing_tree':
+            generator = GrowingTreeMazeGenerator(genPolicy if genPolicy is not None else 'newest')
+        elif genApproach == 'binaryTree':
+            generator = BinaryTreeMazeGenerator()
+        elif genApproach == 'sidewinder':
+            generator = SidewinderMazeGenerator()
         # TODO: If you implement other generators, you can add them here
 
         return generator
 
 
 
-    def match(self, solver: MazeSolver) -> MazeGenerator:
+    def match(self, solver: MazeSolver, searchOptions: dict = None) -> MazeGenerator:
         """
         Task D, with a specified maze generator.
         A solver is provided, and you can access the particular solver by calling its name() method.
 
         @param solver: Instance of a maze solver you should generate a maze to maximize the number of cells it explores.
+        @param searchOptions: Options of the adversarial search that improves the maze by running the solver on
+            candidates (see AdversarialMazeSearch).  Default is None, no search.
         
         @return: Instance of a maze generator.
         """
@@ -48,14 +76,14 @@ class GeneratorSelector:
         solver_name = solver.getName()
 
         if solver_name == 'recur':
-            generator = TaskDMazeGenerator(solver_name)
+            generator = TaskDMazeGenerator(solver_name, searchOptions)
         elif solver_name == 'wall':
-            generator = TaskDMazeGenerator(solver_name)
+            generator = TaskDMazeGenerator(solver_name, searchOptions)
         elif solver_name == 'pledge':
-            generator = TaskDMazeGenerator(solver_name)
+            generator = TaskDMazeGenerator(solver_name, searchOptions)
         elif solver_name == 'taskC':
-            generator = TaskDMazeGenerator(solver_name)
+            generator = TaskDMazeGenerator(solver_name, searchOptions)
         else:
-            generator = TaskDMazeGenerator(solver_name)
+            generator = TaskDMazeGenerator(solver_name, searchOptions)
 
         return generator
@@ -1,26 +1,115 @@
-from typing import List
+from typing import List, Sequence, Tuple
 
-from maze.util import Coordinates3D, WallCoordinates
+from maze.util import Coordinates3D, WallCoordinates, toLabels, toLabelPairs
 from maze.graph import Graph
 
 
 class AdjListGraph(Graph):
     """
-    Represents an undirected graph.  Please DO NOT modify this class.
+    Represents an undirected graph.
     """
 
     def __init__(self):
 
-        # dictionary where the keys are source vertices, and the values is a list of neighbouring vertices.
-        # Essentially implements an adjacency list.
-        self.m_vertListMap :dict[Coordinates3D,List[(Coordinates3D,bool)]] = {}
+        # dictionary where the keys are source vertices, and the values are dictionaries mapping each neighbouring
+        # vertex to the wall status of the edge between them.
+        # Essentially implements an adjacency list, keyed so that edge and wall lookups take constant time.
+        # The neighbour dictionaries keep insertion order, so neighbours are still listed in the order edges were added.
+        self.m_vertListMap :dict[Coordinates3D,dict[Coordinates3D,bool]] = {}
+
+
+
+    def buildGrid(self, levelDims: List[Tuple[int, int]], addWall: bool = False)->bool:
+
+        # Builds the same vertices and edges, in the same order, as adding them one by one level by level and then
+        # between levels, but fills the neighbour dictionaries directly instead of checking every edge for duplicates.
+        self.m_vertListMap = {}
+
+        for level in range(0, len(levelDims)):
+            self.buildLevel(levelDims, level, addWall)
+
+        for level in range(0, len(levelDims) - 1):
+            self.buildLevelLinks(levelDims, level, addWall)
+
+        return True
+
+
+
+    def buildLevel(self, levelDims: List[Tuple[int, int]], level: int, addWall: bool = False)->bool:
+
+        (rowNum, colNum) = levelDims[level]
+        vertListMap = self.m_vertListMap
+
+        # vertices of the level including its boundary, indexed by [row+1][col+1], so that edges share the vertex objects
+        grid = [[Coordinates3D(level, r, c) for c in range(-1, colNum + 1)] for r in range(-1, rowNum + 1)]
+
+        # neighbours of each vertex of the level: cells have their left, right, below and above neighbours, boundary
+        # vertices have the one cell next to them
+        levelNeighs = list()
+        for r in range(1, rowNum + 1):
+            below = grid[r - 1]
+            here = grid[r]
+            above = grid[r + 1]
+            for c in range(1, colNum + 1):
+                levelNeighs.append((here[c], {here[c - 1]: addWall, here[c + 1]: addWall, below[c]: addWall, above[c]: addWall}))
+        levelNeighs.extend([(grid[0][c], {grid[1][c]: addWall}) for c in range(1, colNum + 1)])
+        levelNeighs.extend([(grid[r][0], {grid[r][1]: addWall}) for r in range(1, rowNum + 1)])
+        levelNeighs.extend([(grid[rowNum + 1][c], {grid[rowNum][c]: addWall}) for c in range(1, colNum + 1)])
+        levelNeighs.extend([(grid[r][colNum + 1], {grid[r][colNum]: addWall}) for r in range(1, rowNum + 1)])
+
+        for (vert, neighs) in levelNeighs:
+            # vertices already added by links to an adjacent level (when levels are built lazily) keep those links
+            # after their neighbours on this level
+            existing = vertListMap.get(vert)
+            if existing:
+                neighs.update(existing)
+            vertListMap[vert] = neighs
+
+        return True
+
+
+
+    def buildLevelLinks(self, levelDims: List[Tuple[int, int]], lowerLevel: int, addWall: bool = False)->bool:
+
+        (lowerRowNum, lowerColNum) = levelDims[lowerLevel]
+        (upperRowNum, upperColNum) = levelDims[lowerLevel + 1]
+        vertListMap = self.m_vertListMap
+
+        # first the cells of the lower level, then the cells of the upper level that aren't above one of them
+        pairs = [(r, c) for r in range(0, lowerRowNum) for c in range(0, lowerColNum)]
+        pairs.extend([(r, c) for r in range(0, upperRowNum) for c in range(0, upperColNum) if r >= lowerRowNum or c >= lowerColNum])
+
+        for (r, c) in pairs:
+            lowerVert = Coordinates3D(lowerLevel, r, c)
+            upperVert = Coordinates3D(lowerLevel + 1, r, c)
+
+            # add the vertex on the other level if it doesn't exist, to mark it as a boundary
+            lowerNeighs = vertListMap.get(lowerVert)
+            if lowerNeighs is None:
+                lowerNeighs = vertListMap[lowerVert] = {}
+            upperNeighs = vertListMap.get(upperVert)
+            if upperNeighs is None:
+                upperNeighs = vertListMap[upperVert] = {}
+
+            lowerNeighs[upperVert] = addWall
+            if upperNeighs and next(reversed(upperNeighs)).getLevel() > lowerLevel + 1:
+                # the upper vertex is already linked to the level above it (levels built lazily), keep the link to
+                # the level below first, as when levels are linked in order
+                aboveVert = next(reversed(upperNeighs))
+                aboveWall = upperNeighs.pop(aboveVert)
+                upperNeighs[lowerVert] = addWall
+                upperNeighs[aboveVert] = aboveWall
+            else:
+                upperNeighs[lowerVert] = addWall
+
+        return True
 
 
         
     def addVertex(self, label:Coordinates3D):
 
         if not self.hasVertex(label):
-            self.m_vertListMap[label] = []
+            self.m_vertListMap[label] = {}
 
 
 
@@ -33,62 +122,45 @@ class AdjListGraph(Graph):
 
     def addEdge(self, vert1:Coordinates3D, vert2:Coordinates3D, addWall:bool = False)->bool:
 
-        if self.hasVertex(vert1) and self.hasVertex(vert2):
-            # need to check if edge exists already, if it does, we just return
-            for (neigh,_) in self.m_vertListMap[vert1]:
-                if vert2 == neigh:
-                    return False
-                
-            for (neigh,_) in self.m_vertListMap[vert2]:
-                if vert1 == neigh:
-                    return False
-                    
-            # okay if reach here edge doesn't exist
-            self.m_vertListMap[vert1].append((vert2,addWall))
-            self.m_vertListMap[vert2].append((vert1,addWall))
-            return True
-        else:
+        neighs1 = self.m_vertListMap.get(vert1)
+        neighs2 = self.m_vertListMap.get(vert2)
+        if neighs1 is None or neighs2 is None:
             return False
+
+        # need to check if edge exists already, if it does, we just return
+        if vert2 in neighs1:
+            return False
+
+        # okay if reach here edge doesn't exist
+        neighs1[vert2] = addWall
+        neighs2[vert1] = addWall
+        return True
         
 
 
     def updateWall(self, vert1:Coordinates3D, vert2:Coordinates3D, wallStatus:bool)->bool:
 
         # need to check if vertices are there, and whether edge is there already
-        if self.hasEdge(vert1, vert2):
-            for i in range(len(self.m_vertListMap[vert1])):
-                if self.m_vertListMap[vert1][i][0] == vert2:
-                    self.m_vertListMap[vert1][i] = (vert2, wallStatus)
-                    break
-
-            for j in range(len(self.m_vertListMap[vert2])):
-                if self.m_vertListMap[vert2][j][0] == vert1:
-                    self.m_vertListMap[vert2][j] = (vert1, wallStatus)
-                    break
-    
-            return True
-        
-        # all other cases we return False
-        return False
+        neighs1 = self.m_vertListMap.get(vert1)
+        if neighs1 is None or vert2 not in neighs1:
+            # all other cases we return False
+            return False
+
+        neighs1[vert2] = wallStatus
+        self.m_vertListMap[vert2][vert1] = wallStatus
+        return True
 
 
 
     def removeEdge(self, vert1:Coordinates3D, vert2:Coordinates3D)->bool:
         
-        if self.hasEdge(vert1, vert2):
-            for i in range(len(self.m_vertListMap[vert1])):
-                if self.m_vertListMap[vert1][i][0] == vert2:
-                    self.m_vertListMap[vert1][i] = []
-                    break
-
-            for j in range(len(self.m_vertListMap[vert2])):
-                if self.m_vertListMap[vert2][j][0] == vert1:
-                    self.m_vertListMap[vert2][j] = []
-                    break
-
-            return True
-        else:
+        neighs1 = self.m_vertListMap.get(vert1)
+        if neighs1 is None or vert2 not in neighs1:
             return False
+
+        del neighs1[vert2]
+        del self.m_vertListMap[vert2][vert1]
+        return True
         
 
 
@@ -100,43 +172,56 @@ class AdjListGraph(Graph):
     def hasEdge(self, vert1:Coordinates3D, vert2:Coordinates3D)->bool:
         
         # check if vertices exist first
-        if self.hasVertex(vert1) and self.hasVertex(vert2):
-            for (neigh, _) in self.m_vertListMap[vert1]:
-                if neigh == vert2:
-                    return True
-
-        return False
+        neighs1 = self.m_vertListMap.get(vert1)
+        return neighs1 is not None and vert2 in neighs1
 
 
 
     def getWallStatus(self, vert1:Coordinates3D, vert2:Coordinates3D)->bool:
         
-        # check if vertices exist first
-        if self.hasEdge(vert1,vert2):
-            for (neigh, bEdge) in self.m_vertListMap[vert1]:
-                if neigh == vert2:
-                    return bEdge
-        
-        # all other cases return False
-        return False
+        # check if vertices exist first, all other cases return False
+        neighs1 = self.m_vertListMap.get(vert1)
+        if neighs1 is None:
+            return False
+
+        return neighs1.get(vert2, False)
         
     
 
     def neighbours(self, label:Coordinates3D)->List[Coordinates3D]:
 
         if self.hasVertex(label):
-            return [neigh for (neigh,_) in self.m_vertListMap[label]]
+            return list(self.m_vertListMap[label])
         else:
             return []
         
 
 
+    def hasWalls(self, pairs)->Sequence[bool]:
+
+        vertListMap = self.m_vertListMap
+        noNeighs = {}
+        return [vertListMap.get(vert1, noNeighs).get(vert2, False) for (vert1, vert2) in toLabelPairs(pairs)]
+
+
+
+    def openNeighbours(self, labels)->List[List[Coordinates3D]]:
+
+        vertListMap = self.m_vertListMap
+        noNeighs = {}
+        return [[neigh for (neigh, hasWall) in vertListMap.get(label, noNeighs).items() if not hasWall]
+                for label in toLabels(labels)]
+
+
+
     def neighbourWalls(self, label:Coordinates3D)->List[WallCoordinates]:
 
         if self.hasVertex(label):
-            return [(label, neigh) for (neigh,hasWall) in self.m_vertListMap[label] if hasWall]
+            return [WallCoordinates(label, neigh) for (neigh,hasWall) in self.m_vertListMap[label].items() if hasWall]
+        else:
+            return []
         
 
 
     def vertices(self)->List[Coordinates3D]:
-        return self.m_vertListMap.keys()
\ No newline at end of file
+        return self.m_vertListMap.keys()
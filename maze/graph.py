@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Sequence, Tuple
 
-from maze.util import Coordinates3D, WallCoordinates
+from maze.util import Coordinates3D, WallCoordinates, toLabels, toLabelPairs
 
 
 class Graph:
@@ -8,6 +8,59 @@ class Graph:
     Base class for a graph.  Defines the interface.
     """
     
+    def buildGrid(self, levelDims: List[Tuple[int, int]], addWall: bool = False)->bool:
+        """
+        Builds all the vertices and edges of a 3D maze grid in one go, instead of through individual addVertex() and
+        addEdge() calls.  Backends that don't support this return False, and the grid should then be built
+        through addVertex() and addEdge().
+
+        @param levelDims: (rowNum, colNum) of each level, starting at level 0.
+        @param addWall: Whether to add walls on all the edges as well.  Default is False.
+
+        @returns True if the grid was built, otherwise False.
+        """
+        return False
+
+
+
+    def buildLevel(self, levelDims: List[Tuple[int, int]], level: int, addWall: bool = False)->bool:
+        """
+        Builds the cells and boundary vertices of one level of a 3D maze grid, with the edges between them.  Levels can
+        be built in any order, which allows a grid to be built lazily.  Backends that don't support this return False.
+
+        @param levelDims: (rowNum, colNum) of each level, starting at level 0.
+        @param level: Level to build.
+        @param addWall: Whether to add walls on the edges as well.  Default is False.
+
+        @returns True if the level was built, otherwise False.
+        """
+        return False
+
+
+
+    def buildLevelLinks(self, levelDims: List[Tuple[int, int]], lowerLevel: int, addWall: bool = False)->bool:
+        """
+        Builds the edges between a level of a 3D maze grid and the level above it, one for every cell of either level.
+        Vertices on the other level are added as needed.  Backends that don't support this return False.
+
+        @param levelDims: (rowNum, colNum) of each level, starting at level 0.
+        @param lowerLevel: Lower of the two levels to link.
+        @param addWall: Whether to add walls on the edges as well.  Default is False.
+
+        @returns True if the links were built, otherwise False.
+        """
+        return False
+
+
+
+    def close(self):
+        """
+        Releases any resources held by the graph, such as open files.  In-memory graphs hold none.
+        """
+        pass
+
+
+
     def addVertex(self, label:Coordinates3D):
         """
         Adds a vertex to the graph.
@@ -139,5 +192,50 @@ class Graph:
 
 
 
+    def hasWalls(self, pairs)->Sequence[bool]:
+        """
+        Batch version of getWallStatus().  The base implementation checks one edge at a time, backends can override
+        this to amortise the per call overhead.
+
+        @param pairs: Sequence of (vert1, vert2) label pairs, or integer array of shape (n, 2, 3) of (level, row, col).
+
+        @returns Sequence of the wall status of each pair, False for pairs that aren't edges.
+        """
+        return [self.getWallStatus(vert1, vert2) for (vert1, vert2) in toLabelPairs(pairs)]
+
+
+
+    def addWalls(self, pairs)->int:
+        """
+        Batch version of updateWall(), adding walls.
+
+        @param pairs: Sequence of (vert1, vert2) label pairs, or integer array of shape (n, 2, 3) of (level, row, col).
+
+        @returns Number of walls set.  Pairs that aren't edges are skipped.
+        """
+        return sum(1 for (vert1, vert2) in toLabelPairs(pairs) if self.updateWall(vert1, vert2, True))
 
 
+
+    def removeWalls(self, pairs)->int:
+        """
+        Batch version of updateWall(), removing walls.
+
+        @param pairs: Sequence of (vert1, vert2) label pairs, or integer array of shape (n, 2, 3) of (level, row, col).
+
+        @returns Number of walls cleared.  Pairs that aren't edges are skipped.
+        """
+        return sum(1 for (vert1, vert2) in toLabelPairs(pairs) if self.updateWall(vert1, vert2, False))
+
+
+
+    def openNeighbours(self, labels)->List[List[Coordinates3D]]:
+        """
+        Retrieves the neighbours of many vertices that aren't separated from them by a wall.
+
+        @param labels: Sequence of labels, or integer array of shape (n, 3) of (level, row, col).
+
+        @returns For each label, the list of its neighbours without a wall in between, in the order of neighbours().
+        """
+        return [[neigh for neigh in self.neighbours(label) if not self.getWallStatus(label, neigh)]
+                for label in toLabels(labels)]
@@ -0,0 +1,490 @@
+from typing import List, Sequence, Tuple
+from itertools import chain
+
+import numpy as np
+
+from maze.util import Coordinates3D, WallCoordinates
+from maze.graph import Graph
+
+
+class GridGraph(Graph):
+    """
+    Represents the undirected grid graph of a 3D maze, where the wall status of every edge is kept in dense
+    NumPy arrays rather than in per-vertex adjacency lists.  The vertices and edges themselves are implied by the
+    level dimensions passed to buildGrid(), so this backend only uses one byte per wall.
+
+    For a level of dimensions (rowNum, colNum), the walls are stored in three arrays:
+        - column walls, shape (rowNum, colNum+1): [r, c+1] is the wall between (r, c) and (r, c+1).
+        - row walls, shape (rowNum+1, colNum): [r+1, c] is the wall between (r, c) and (r+1, c).
+        - level walls, shape (max rows, max cols) of this and the next level: [r, c] is the wall between
+          (level, r, c) and (level+1, r, c).  Only positions that are a cell on either level are edges.
+    The boundary walls are therefore the first/last columns and rows of the first two arrays.
+
+    The arrays of all levels are views into one buffer, which wall slots index into, so building a single level (see
+    buildLevel()) allocates the walls of the whole maze.  Lazy mazes on this backend only defer setting the walls of
+    each level, not the memory for them.
+    """
+
+    # (level, row, col) offsets of the neighbours of a vertex, in the order neighbours() lists them.
+    NEIGHBOUR_OFFSETS = np.array([(0, 0, -1), (0, 0, 1), (0, -1, 0), (0, 1, 0), (-1, 0, 0), (1, 0, 0)], dtype=np.int64)
+
+    def __init__(self):
+
+        # (rowNum, colNum) of each level.
+        self.m_levelDims: List[Tuple[int, int]] = list()
+
+        # Wall status of every edge, one byte per wall.  Levels are laid out one after the other, each level
+        # being its column walls, then row walls, then level walls (to the level above), padded to a multiple of 8.
+        self.m_walls: bytearray = bytearray()
+
+        # Offset in m_walls of the column, row and level walls of each level.
+        self.m_colWallOffsets: List[int] = list()
+        self.m_rowWallOffsets: List[int] = list()
+        self.m_levelWallOffsets: List[int] = list()
+        # Number of columns of the level walls array of each level (max of the columns of level and level+1).
+        self.m_levelWallCols: List[int] = list()
+
+        # NumPy views into m_walls of the column, row and level walls of each level.
+        self.m_colWalls: List[np.ndarray] = list()
+        self.m_rowWalls: List[np.ndarray] = list()
+        self.m_levelWalls: List[np.ndarray] = list()
+
+
+
+    def buildGrid(self, levelDims: List[Tuple[int, int]], addWall: bool = False)->bool:
+
+        self._allocate(levelDims)
+
+        # only fill the slots that are edges, padding and level walls with no cell on either side stay 0
+        if addWall:
+            for level in range(0, len(self.m_levelDims)):
+                self.buildLevel(levelDims, level, addWall)
+            for level in range(0, len(self.m_levelDims) - 1):
+                self.buildLevelLinks(levelDims, level, addWall)
+
+        return True
+
+
+
+    def buildLevel(self, levelDims: List[Tuple[int, int]], level: int, addWall: bool = False)->bool:
+
+        # the first level built allocates the walls of every level, only their initialisation is per level
+        if self.m_levelDims != [(rowNum, colNum) for (rowNum, colNum) in levelDims]:
+            self._allocate(levelDims)
+
+        self.m_colWalls[level][:] = addWall
+        self.m_rowWalls[level][:] = addWall
+        return True
+
+
+
+    def buildLevelLinks(self, levelDims: List[Tuple[int, int]], lowerLevel: int, addWall: bool = False)->bool:
+
+        if self.m_levelDims != [(rowNum, colNum) for (rowNum, colNum) in levelDims]:
+            self._allocate(levelDims)
+
+        (lowerRowNum, lowerColNum) = self.m_levelDims[lowerLevel]
+        (upperRowNum, upperColNum) = self.m_levelDims[lowerLevel + 1]
+        self.m_levelWalls[lowerLevel][:lowerRowNum, :lowerColNum] = addWall
+        self.m_levelWalls[lowerLevel][:upperRowNum, :upperColNum] = addWall
+        return True
+
+
+
+    def addVertex(self, label:Coordinates3D):
+        # vertices are implied by the level dimensions
+        pass
+
+
+
+    def addVertices(self, vertLabels:List[Coordinates3D]):
+        # vertices are implied by the level dimensions
+        pass
+
+
+
+    def addEdge(self, vert1:Coordinates3D, vert2:Coordinates3D, addWall:bool = False)->bool:
+
+        # edges are implied by the level dimensions, so adding one only sets its wall
+        return self.updateWall(vert1, vert2, addWall)
+
+
+
+    def updateWall(self, vert1:Coordinates3D, vert2:Coordinates3D, wallStatus:bool)->bool:
+
+        slot = self._wallSlot(vert1, vert2)
+        if slot < 0:
+            return False
+
+        self.m_walls[slot] = 1 if wallStatus else 0
+        return True
+
+
+
+    def removeEdge(self, vert1:Coordinates3D, vert2:Coordinates3D)->bool:
+        # the grid topology is fixed by the level dimensions, edges cannot be removed
+        return False
+
+
+
+    def hasVertex(self, label:Coordinates3D)->bool:
+
+        level = label.getLevel()
+        if level < 0 or level >= len(self.m_levelDims):
+            return False
+
+        row = label.getRow()
+        col = label.getCol()
+
+        # interior cells and boundary cells (excluding corners) of the level
+        (rowNum, colNum) = self.m_levelDims[level]
+        if (-1 <= row <= rowNum and 0 <= col < colNum) or (0 <= row < rowNum and -1 <= col <= colNum):
+            return True
+
+        # vertices above or below a cell of an adjacent level
+        return self._isCell(level - 1, row, col) or self._isCell(level + 1, row, col)
+
+
+
+    def hasEdge(self, vert1:Coordinates3D, vert2:Coordinates3D)->bool:
+        return self._wallSlot(vert1, vert2) >= 0
+
+
+
+    def getWallStatus(self, vert1:Coordinates3D, vert2:Coordinates3D)->bool:
+
+        slot = self._wallSlot(vert1, vert2)
+        if slot < 0:
+            return False
+
+        return self.m_walls[slot] == 1
+
+
+
+    def neighbours(self, label:Coordinates3D)->List[Coordinates3D]:
+
+        if not self.hasVertex(label):
+            return []
+
+        level = label.getLevel()
+        row = label.getRow()
+        col = label.getCol()
+        (rowNum, colNum) = self.m_levelDims[level]
+
+        # same order as the adjacency list construction: left, right, below, above, level below, level above
+        neighs = list()
+        if 0 <= row < rowNum:
+            if -1 <= col - 1 < colNum:
+                neighs.append(Coordinates3D(level, row, col - 1))
+            if -1 <= col < colNum:
+                neighs.append(Coordinates3D(level, row, col + 1))
+        if 0 <= col < colNum:
+            if -1 <= row - 1 < rowNum:
+                neighs.append(Coordinates3D(level, row - 1, col))
+            if -1 <= row < rowNum:
+                neighs.append(Coordinates3D(level, row + 1, col))
+        if level > 0 and (self._isCell(level, row, col) or self._isCell(level - 1, row, col)):
+            neighs.append(Coordinates3D(level - 1, row, col))
+        if level < len(self.m_levelDims) - 1 and (self._isCell(level, row, col) or self._isCell(level + 1, row, col)):
+            neighs.append(Coordinates3D(level + 1, row, col))
+
+        return neighs
+
+
+
+    def hasWalls(self, pairs)->Sequence[bool]:
+        return self._slotWallStatuses(self._wallSlots(pairs))
+
+
+
+    def addWalls(self, pairs)->int:
+        return self._updateWalls(pairs, True)
+
+
+
+    def removeWalls(self, pairs)->int:
+        return self._updateWalls(pairs, False)
+
+
+
+    def openNeighbours(self, labels)->List[List[Coordinates3D]]:
+
+        if not isinstance(labels, np.ndarray):
+            labels = list(labels)
+            labels = np.fromiter(chain.from_iterable(labels), dtype=np.int64, count=3 * len(labels))
+        labels = labels.astype(np.int64, copy=False).reshape(-1, 3)
+        # candidate neighbours, in the order of neighbours(), and whether each is an edge without a wall
+        candidates = labels[:, None, :] + GridGraph.NEIGHBOUR_OFFSETS[None, :, :]
+        pairs = np.stack([np.broadcast_to(labels[:, None, :], candidates.shape), candidates], axis=2)
+        slots = self._wallSlots(pairs)
+        isOpen = ((slots >= 0) & ~self._slotWallStatuses(slots)).reshape(-1, len(GridGraph.NEIGHBOUR_OFFSETS))
+
+        return [[Coordinates3D(*neigh) for (neigh, neighOpen) in zip(labelCandidates, labelOpen) if neighOpen]
+                for (labelCandidates, labelOpen) in zip(candidates.tolist(), isOpen.tolist())]
+
+
+
+    def neighbourWalls(self, label:Coordinates3D)->List[WallCoordinates]:
+        return [WallCoordinates(label, neigh) for neigh in self.neighbours(label) if self.getWallStatus(label, neigh)]
+
+
+
+    def vertices(self)->List[Coordinates3D]:
+
+        # same order as the adjacency list construction, first the cells and boundary of each level
+        verts = list()
+        for level, (rowNum, colNum) in enumerate(self.m_levelDims):
+            verts.extend([Coordinates3D(level, r, c) for r in range(0, rowNum) for c in range(0, colNum)])
+            verts.extend([Coordinates3D(level, -1, c) for c in range(0, colNum)])
+            verts.extend([Coordinates3D(level, r, -1) for r in range(0, rowNum)])
+            verts.extend([Coordinates3D(level, rowNum, c) for c in range(0, colNum)])
+            verts.extend([Coordinates3D(level, r, colNum) for r in range(0, rowNum)])
+
+        # then the vertices above and below cells of adjacent levels, that aren't already part of their level
+        seen = set()
+        for level in range(0, len(self.m_levelDims) - 1):
+            (lowerRowNum, lowerColNum) = self.m_levelDims[level]
+            (upperRowNum, upperColNum) = self.m_levelDims[level + 1]
+            for (vertLevel, rowNum, colNum) in [(level + 1, lowerRowNum, lowerColNum), (level, upperRowNum, upperColNum)]:
+                for r in range(0, rowNum):
+                    for c in range(0, colNum):
+                        if not self._isLevelVertex(vertLevel, r, c) and (vertLevel, r, c) not in seen:
+                            seen.add((vertLevel, r, c))
+                            verts.append(Coordinates3D(vertLevel, r, c))
+
+        return verts
+
+
+
+    def __getstate__(self)->dict:
+        """
+        Pickles the walls packed into bits, rather than the views into them, e.g., to send mazes between processes.
+        """
+        return {'levelDims': self.m_levelDims,
+                'walls': np.packbits(np.frombuffer(self.m_walls, dtype=np.uint8), bitorder='little').tobytes()}
+
+
+
+    def __setstate__(self, state: dict):
+        self.__init__()
+        self._allocate(state['levelDims'])
+        packed = np.frombuffer(state['walls'], dtype=np.uint8)
+        np.frombuffer(self.m_walls, dtype=np.uint8)[:] = np.unpackbits(packed, bitorder='little')
+
+
+
+    def _isCell(self, level: int, row: int, col: int)->bool:
+        """
+        @returns True if (level, row, col) is an interior cell of the maze.
+        """
+        if level < 0 or level >= len(self.m_levelDims):
+            return False
+        (rowNum, colNum) = self.m_levelDims[level]
+        return 0 <= row < rowNum and 0 <= col < colNum
+
+
+
+    def _isLevelVertex(self, level: int, row: int, col: int)->bool:
+        """
+        @returns True if (level, row, col) is an interior or boundary (non corner) vertex of its own level.
+        """
+        (rowNum, colNum) = self.m_levelDims[level]
+        return (-1 <= row <= rowNum and 0 <= col < colNum) or (0 <= row < rowNum and -1 <= col <= colNum)
+
+
+
+    def _wallSlot(self, vert1:Coordinates3D, vert2:Coordinates3D)->int:
+        """
+        @returns Index in m_walls of the wall between vert1 and vert2, or -1 if they don't share an edge.
+        """
+        level1 = vert1.getLevel()
+        row1 = vert1.getRow()
+        col1 = vert1.getCol()
+        level2 = vert2.getLevel()
+        row2 = vert2.getRow()
+        col2 = vert2.getCol()
+
+        if level1 == level2:
+            if level1 < 0 or level1 >= len(self.m_levelDims):
+                return -1
+            (rowNum, colNum) = self.m_levelDims[level1]
+
+            # wall between two cells of the same row
+            if row1 == row2 and (col1 - col2 == 1 or col2 - col1 == 1):
+                col = min(col1, col2)
+                if 0 <= row1 < rowNum and -1 <= col < colNum:
+                    return self.m_colWallOffsets[level1] + row1 * (colNum + 1) + col + 1
+
+            # wall between two cells of the same column
+            elif col1 == col2 and (row1 - row2 == 1 or row2 - row1 == 1):
+                row = min(row1, row2)
+                if 0 <= col1 < colNum and -1 <= row < rowNum:
+                    return self.m_rowWallOffsets[level1] + (row + 1) * colNum + col1
+
+        # wall between two levels
+        elif row1 == row2 and col1 == col2 and (level1 - level2 == 1 or level2 - level1 == 1):
+            level = min(level1, level2)
+            if level < 0 or level >= len(self.m_levelDims) - 1:
+                return -1
+            if self._isCell(level, row1, col1) or self._isCell(level + 1, row1, col1):
+                return self.m_levelWallOffsets[level] + row1 * self.m_levelWallCols[level] + col1
+
+        return -1
+
+
+
+    def _wallSlots(self, pairs)->np.ndarray:
+        """
+        Vectorised version of _wallSlot().
+
+        @param pairs: Sequence of (vert1, vert2) label pairs, or integer array of shape (n, 2, 3) of (level, row, col).
+
+        @returns Array of the index in m_walls of the wall between each pair, or -1 where they don't share an edge.
+        """
+        if not isinstance(pairs, np.ndarray):
+            # much faster than letting NumPy work out the nesting of the tuples
+            pairs = list(pairs)
+            pairs = np.fromiter(chain.from_iterable(chain.from_iterable(pairs)), dtype=np.int64, count=6 * len(pairs))
+        pairs = pairs.astype(np.int64, copy=False).reshape(-1, 2, 3)
+        (level1, row1, col1) = (pairs[:, 0, 0], pairs[:, 0, 1], pairs[:, 0, 2])
+        (level2, row2, col2) = (pairs[:, 1, 0], pairs[:, 1, 1], pairs[:, 1, 2])
+        level = np.minimum(level1, level2)
+        row = np.minimum(row1, row2)
+        col = np.minimum(col1, col2)
+
+        # per level tables, with an extra empty level that out of range levels are looked up as
+        levelNum = len(self.m_levelDims)
+        rowNums = np.array([rowNum for (rowNum, _) in self.m_levelDims] + [0], dtype=np.int64)
+        colNums = np.array([colNum for (_, colNum) in self.m_levelDims] + [0], dtype=np.int64)
+        colWallOffsets = np.array(self.m_colWallOffsets + [0], dtype=np.int64)
+        rowWallOffsets = np.array(self.m_rowWallOffsets + [0], dtype=np.int64)
+        levelWallOffsets = np.array(self.m_levelWallOffsets + [0], dtype=np.int64)
+        levelWallCols = np.array(self.m_levelWallCols + [0], dtype=np.int64)
+
+        lowerLevel = np.where((level >= 0) & (level < levelNum), level, levelNum)
+        upperLevel = np.where((level >= 0) & (level < levelNum - 1), level + 1, levelNum)
+        rowNum = rowNums[lowerLevel]
+        colNum = colNums[lowerLevel]
+
+        sameLevel = level1 == level2
+        # wall between two cells of the same row
+        isColWall = sameLevel & (row1 == row2) & (np.abs(col1 - col2) == 1) & (row >= 0) & (row < rowNum) & \
+            (col >= -1) & (col < colNum)
+        # wall between two cells of the same column
+        isRowWall = sameLevel & (col1 == col2) & (np.abs(row1 - row2) == 1) & (col >= 0) & (col < colNum) & \
+            (row >= -1) & (row < rowNum)
+        # wall between two levels, below or above a cell
+        isCell = (row >= 0) & (col >= 0)
+        isLevelWall = (row1 == row2) & (col1 == col2) & (np.abs(level1 - level2) == 1) & (upperLevel < levelNum) & \
+            isCell & (((row < rowNum) & (col < colNum)) | ((row < rowNums[upperLevel]) & (col < colNums[upperLevel])))
+
+        return np.select([isColWall, isRowWall, isLevelWall],
+                         [colWallOffsets[lowerLevel] + row * (colNum + 1) + col + 1,
+                          rowWallOffsets[lowerLevel] + (row + 1) * colNum + col,
+                          levelWallOffsets[lowerLevel] + row * levelWallCols[lowerLevel] + col], -1)
+
+
+
+    def _slotWallStatuses(self, slots: np.ndarray)->np.ndarray:
+        """
+        @param slots: Array of indices in m_walls, -1 for pairs that aren't edges.
+
+        @returns Boolean array of whether there is a wall in each slot, False for -1.
+        """
+        walls = np.frombuffer(self.m_walls, dtype=np.uint8)
+        return (slots >= 0) & (walls[np.maximum(slots, 0)] == 1)
+
+
+
+    def _updateWalls(self, pairs, wallStatus: bool)->int:
+        """
+        Vectorised version of updateWall().
+
+        @returns Number of walls updated.
+        """
+        slots = self._wallSlots(pairs)
+        slots = slots[slots >= 0]
+        np.frombuffer(self.m_walls, dtype=np.uint8)[slots] = 1 if wallStatus else 0
+        return len(slots)
+
+
+
+    def _allocate(self, levelDims: List[Tuple[int, int]]):
+        """
+        Allocates the wall storage for the given level dimensions, with no walls.
+
+        @param levelDims: (rowNum, colNum) of each level.
+        """
+        self.m_walls = bytearray(self._layout(levelDims))
+        self._createViews(np.frombuffer(self.m_walls, dtype=np.uint8))
+
+
+
+    def _layout(self, levelDims: List[Tuple[int, int]])->int:
+        """
+        Works out where the walls of each level sit in the flat storage.  Each level starts at a multiple of 8 walls,
+        so that when the walls are packed into bits, every level starts on a byte boundary.
+
+        @param levelDims: (rowNum, colNum) of each level.
+
+        @returns Total number of wall slots, including padding.
+        """
+        self.m_levelDims = [(rowNum, colNum) for (rowNum, colNum) in levelDims]
+        self.m_colWallOffsets = list()
+        self.m_rowWallOffsets = list()
+        self.m_levelWallOffsets = list()
+        self.m_levelWallCols = list()
+
+        size = 0
+        for level in range(0, len(self.m_levelDims)):
+            (colWallShape, rowWallShape, levelWallShape) = GridGraph.wallShapes(self.m_levelDims, level)
+            self.m_colWallOffsets.append(size)
+            size += colWallShape[0] * colWallShape[1]
+            self.m_rowWallOffsets.append(size)
+            size += rowWallShape[0] * rowWallShape[1]
+            # level walls only exist between this level and the one above it
+            self.m_levelWallOffsets.append(size)
+            self.m_levelWallCols.append(levelWallShape[1])
+            size += levelWallShape[0] * levelWallShape[1]
+
+            # pad to a byte boundary
+            size = (size + 7) // 8 * 8
+
+        return size
+
+
+
+    def _createViews(self, wallArray: np.ndarray):
+        """
+        Creates the per level views of the column, row and level walls.
+
+        @param wallArray: NumPy array over the flat wall storage.
+        """
+        self.m_colWalls = list()
+        self.m_rowWalls = list()
+        self.m_levelWalls = list()
+
+        for level in range(0, len(self.m_levelDims)):
+            (colWallShape, rowWallShape, levelWallShape) = GridGraph.wallShapes(self.m_levelDims, level)
+            for (walls, start, shape) in [(self.m_colWalls, self.m_colWallOffsets[level], colWallShape),
+                                          (self.m_rowWalls, self.m_rowWallOffsets[level], rowWallShape),
+                                          (self.m_levelWalls, self.m_levelWallOffsets[level], levelWallShape)]:
+                walls.append(wallArray[start:start + shape[0] * shape[1]].reshape(shape))
+
+
+
+    @staticmethod
+    def wallShapes(levelDims: List[Tuple[int, int]], level: int)->Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]:
+        """
+        @param levelDims: (rowNum, colNum) of each level.
+        @param level: Level to get the wall array shapes of.
+
+        @returns Shapes of the column, row and level wall arrays of a level.
+        """
+        (rowNum, colNum) = levelDims[level]
+        if level < len(levelDims) - 1:
+            levelWallShape = (max(rowNum, levelDims[level + 1][0]), max(colNum, levelDims[level + 1][1]))
+        else:
+            levelWallShape = (0, 0)
+
+        return ((rowNum, colNum + 1), (rowNum + 1, colNum), levelWallShape)
@@ -1,10 +1,20 @@
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+from array import array
 from enum import Enum
+from bisect import bisect_right
 
 from maze.util import Coordinates3D, WallCoordinates
 from maze.graph import Graph
 from maze.adjListGraph import AdjListGraph
 
+# The binary maze file format needs numpy, which in-memory mazes don't.
+try:
+    import numpy as np
+    from maze import mazeFile
+except ImportError:
+    np = None
+    mazeFile = None
+
 
 
 
@@ -21,15 +31,35 @@ class Maze3D:
         ROW_NUM = 0
         COL_NUM = 1
 
+    # Inner class, used to define constants for the direction part of a wall id, see wallId().
+    class WallDirection(Enum):
+        PLUS_ROW = 0
+        PLUS_COL = 1
+        PLUS_LEVEL = 2
+        MINUS_ROW = 3
+        MINUS_COL = 4
+        MINUS_LEVEL = 5
+
+    # (level, row, col) offset of the cell on the other side of the wall, indexed by WallDirection value.
+    WALL_OFFSETS: List[Tuple[int, int, int]] = [(0, 1, 0), (0, 0, 1), (1, 0, 0), (0, -1, 0), (0, 0, -1), (-1, 0, 0)]
+    # Number of wall directions, i.e., wall ids per cell id.
+    WALL_DIRECTION_NUM: int = 6
 
 
-    def __init__(self, levelDims: List[Tuple[int, int]]):
+
+    def __init__(self, levelDims: List[Tuple[int, int]], graph: Graph = None, lazy: bool = False):
         """
         Constructor.
 
         @param levelDims: list of tuples storing the specifications of each level in our maze, starting at level 0.
             Each tuple is (rowNum, colNum), where rowNum and colNum are the number of rows and columns for that level.
             The left, bottom cell for each level is always (0,0).
+        @param graph: Graph used to store the cells and walls of the maze, e.g., a GridGraph for large mazes.
+            Default is None, which uses an AdjListGraph.
+        @param lazy: Whether initCells() should only build each level (its cells, walls and links to the adjacent
+            levels) the first time the level is accessed, rather than all levels up front.  With a GridGraph, this
+            only defers setting the walls of each level, as the graph allocates the walls of all levels at once.
+            Default is False.
         """
 
         # (rowNum, colNum)
@@ -40,8 +70,32 @@ class Maze3D:
         self.m_entrance: List[Coordinates3D] = list()
         self.m_exit: List[Coordinates3D] = list()
 
-        # self.m_graph: We use an adjacency list representation to store our neighbourhoods and wall information.
-        self.m_graph : Graph = AdjListGraph()
+        # self.m_graph: By default we use an adjacency list representation to store our neighbourhoods and wall information.
+        self.m_graph : Graph = graph if graph is not None else AdjListGraph()
+
+        # self.m_levelOffsets: cell id of the first cell of each level, with the total number of (interior) cells at the
+        # end.  Cells are given dense integer ids, level by level and row by row, see cellId().
+        self.m_levelOffsets: List[int] = [0]
+        for (rowNum, colNum) in self.m_levelDims:
+            self.m_levelOffsets.append(self.m_levelOffsets[-1] + rowNum * colNum)
+
+        # self.m_lazy: whether levels are built on first access.  See _buildLevel().
+        self.m_lazy: bool = lazy
+        # self.m_lazyPending: True while some levels of a lazy maze are still to be built.
+        self.m_lazyPending: bool = False
+        # self.m_lazyWallFlag: addWallFlag passed to initCells(), used when building the remaining levels.
+        self.m_lazyWallFlag: bool = False
+        # self.m_levelBuilt: whether each level has been built.  m_levelLinksBuilt: whether the links between each level
+        # and the level above it have been built.
+        self.m_levelBuilt: List[bool] = [False] * len(self.m_levelDims)
+        self.m_levelLinksBuilt: List[bool] = [False] * max(0, len(self.m_levelDims) - 1)
+
+        # self.m_passable: cache of the passable neighbours of the cells of each level looked up so far, by level, see
+        # passableNeighbours().  None when it needs to be rebuilt, i.e., after walls or exits have changed.
+        self.m_passable: dict = None
+
+        # self.m_idNeighbourTable: cache of idNeighbourTable(), which only depends on the level dimensions.
+        self.m_idNeighbourTable: Tuple[array, bytearray] = None
 
 
 
@@ -52,6 +106,22 @@ class Maze3D:
         @param addWallFlag: Whether we should also add the walls between all adjacent cells as we are initiasing
             the maze.  Default is False.
         """
+
+        self.m_passable = None
+        self.m_levelBuilt = [True] * len(self.m_levelDims)
+        self.m_levelLinksBuilt = [True] * max(0, len(self.m_levelDims) - 1)
+
+        # Lazy mazes only build the levels as they are accessed.
+        if self.m_lazy:
+            self.m_lazyWallFlag = addWallFlag
+            self.m_lazyPending = True
+            self.m_levelBuilt = [False] * len(self.m_levelDims)
+            self.m_levelLinksBuilt = [False] * max(0, len(self.m_levelDims) - 1)
+            return
+
+        # Let the graph build the whole grid at once if it can.
+        if self.m_graph.buildGrid(self.m_levelDims, addWallFlag):
+            return
         
         # Loop through each level, and add the cells/vertices and neighbourhoods/edges to the graph representation.
         for level, (rowNum, colNum) in enumerate(self.m_levelDims):
@@ -112,7 +182,10 @@ class Maze3D:
         """
         # checks if Coordinates3D are valid
         assert(self.checkCoordinates(cell1) and self.checkCoordinates(cell2))
-        
+
+        if self.m_lazyPending:
+            self._buildLevels(cell1, cell2)
+        self.m_passable = None
         self.m_graph.updateWall(cell1, cell2, True)
 
 
@@ -129,6 +202,9 @@ class Maze3D:
         # checks if Coordinates3D are valid
         assert(self.checkCoordinates(cell1) and self.checkCoordinates(cell2))
 
+        if self.m_lazyPending:
+            self._buildLevels(cell1, cell2)
+        self.m_passable = None
         self.m_graph.updateWall(cell1, cell2, False)
 
 
@@ -139,6 +215,8 @@ class Maze3D:
 
         @returns: Return the neighbours of cell.
         """
+        if self.m_lazyPending:
+            self._buildLevels(cell)
         return self.m_graph.neighbours(cell)
 
 
@@ -149,6 +227,8 @@ class Maze3D:
 
         @returns: Return the coordinates of walls that are neighbours of cell.
         """
+        if self.m_lazyPending:
+            self._buildLevels(cell)
         return self.m_graph.neighbourWalls(cell)
 
 
@@ -157,10 +237,108 @@ class Maze3D:
         """
         @returns: Return all cells in the maze.
         """
+        if self.m_lazyPending:
+            self.buildAllLevels()
         return self.m_graph.vertices()
 
 
 
+    def hasWalls(self, pairs)->Sequence[bool]:
+        """
+        Checks for walls between many pairs of cells at once, which lets the graph amortise the per call overhead.
+
+        @param pairs: Sequence of (cell1, cell2) pairs of Coordinates3D, or integer array of shape (n, 2) of pairs of
+            cell ids.
+
+        @returns Sequence of whether there is a wall between each pair.
+        """
+        return self.m_graph.hasWalls(self._batchPairs(pairs))
+
+
+
+    def addWalls(self, pairs)->int:
+        """
+        Adds walls between many pairs of cells at once.  Unlike addWall(), pairs that aren't adjacent are skipped
+        rather than asserted on.
+
+        @param pairs: Sequence of (cell1, cell2) pairs of Coordinates3D, integer array of shape (n, 2) of pairs of
+            cell ids, or integer array of shape (n, 2, 3) of (level, row, col), which can include boundary cells.
+
+        @returns Number of walls added.
+        """
+        self.m_passable = None
+        return self.m_graph.addWalls(self._batchPairs(pairs))
+
+
+
+    def removeWalls(self, pairs)->int:
+        """
+        Removes walls between many pairs of cells at once.  Unlike removeWall(), pairs that aren't adjacent are
+        skipped rather than asserted on.
+
+        @param pairs: Sequence of (cell1, cell2) pairs of Coordinates3D, or integer array of shape (n, 2) of pairs of
+            cell ids.
+
+        @returns Number of walls removed.
+        """
+        self.m_passable = None
+        return self.m_graph.removeWalls(self._batchPairs(pairs))
+
+
+
+    def openNeighbours(self, cells)->List[List]:
+        """
+        Retrieves the neighbours of many cells that can be moved to, i.e., that aren't separated from them by a wall.
+
+        @param cells: Sequence of Coordinates3D, or integer array of cell ids.
+
+        @returns For each cell, the list of its neighbours without a wall in between, in the order of neighbours().
+            For cell ids, these are the ids of the neighbouring interior cells.
+        """
+        if np is not None and isinstance(cells, np.ndarray) and cells.ndim == 1:
+            coordNeighs = self.m_graph.openNeighbours(self._batchCells(self._idCoords(cells)))
+            return [[neighId for neighId in map(self.cellId, neighs) if neighId >= 0] for neighs in coordNeighs]
+
+        return self.m_graph.openNeighbours(self._batchCells(cells))
+
+
+
+    def passableNeighbours(self, cell:Coordinates3D)->List[Coordinates3D]:
+        """
+        Retrieves the neighbours a solver can move to from a cell: the ones without a wall in between that are either
+        interior cells or exits.  The neighbours of all the cells of a level, boundary included, are worked out in one
+        go the first time a cell of the level is looked up, and kept until walls or exits change, so solvers get them
+        with one lookup per step.  Lazy and memory-mapped mazes are only read where they are solved, so they work out
+        the neighbours of each cell on its own instead.
+
+        @param cell: Coordinates of the cell to find the passable neighbours for.
+
+        @returns List of the passable neighbours of cell, in the order of neighbours().  Returns empty list if none, or
+            if cell isn't in the maze.
+        """
+        level: int = cell.getLevel()
+        if level < 0 or level >= len(self.m_levelDims):
+            return []
+
+        if self.m_lazy or (mazeFile is not None and isinstance(self.m_graph, mazeFile.MmapGridGraph)):
+            if self.m_lazyPending:
+                self._buildLevels(cell)
+            return [neigh for neigh in self.openNeighbours([cell])[0] if neigh in self.m_exit or self.cellId(neigh) >= 0]
+
+        if self.m_passable is None:
+            self.m_passable = dict()
+        levelPassable = self.m_passable.get(level)
+        if levelPassable is None:
+            cells = self._levelVertices(level)
+            exits = set(self.m_exit)
+            levelPassable = {levelCell: [neigh for neigh in neighs if neigh in exits or self.cellId(neigh) >= 0]
+                             for (levelCell, neighs) in zip(cells, self.openNeighbours(cells))}
+            self.m_passable[level] = levelPassable
+
+        return levelPassable.get(cell, [])
+
+
+
     def storeEntrance(self, cell: Coordinates3D)->bool:
         """
         Adds an entrance to the maze.  A maze can have more than one entrance, so this method can be called more than once.
@@ -197,6 +375,7 @@ class Maze3D:
         # check if cell of exit is on the boundary of the maze, as an exit should only be added along the boundary
         if self.isBoundary(cell):
             self.m_exit.append(cell)
+            self.m_passable = None
 
             return True
         else:
@@ -286,6 +465,8 @@ class Maze3D:
         @returns True, if the cell exists.
 
         """
+        if self.m_lazyPending:
+            self._buildLevels(cell)
         return self.m_graph.hasVertex(cell)
 
 
@@ -300,6 +481,8 @@ class Maze3D:
         @returns True, if there is a wall between the two specified cells.
 
         """
+        if self.m_lazyPending:
+            self._buildLevels(cell1, cell2)
         return self.m_graph.getWallStatus(cell1, cell2)
 
 
@@ -391,4 +574,493 @@ class Maze3D:
 
 
 
-    
\ No newline at end of file
+    def interiorCellNum(self)->int:
+        """
+        @returns The total number of (interior) cells the maze has over all levels, i.e., the number of cell ids.
+        """
+        return self.m_levelOffsets[-1]
+
+
+
+    def cellId(self, coord:Coordinates3D)->int:
+        """
+        Maps an interior cell to its integer id.  Ids are dense, from 0 to interiorCellNum()-1, and given level by
+        level, row by row: levelOffset + row * colNum + col.
+
+        @param coord: Cell to get the id of.
+
+        @returns Id of coord, or -1 if coord is not an interior cell (e.g., on the boundary).
+        """
+        level: int = coord.getLevel()
+        row: int = coord.getRow()
+        col: int = coord.getCol()
+
+        if level < 0 or level >= len(self.m_levelDims):
+            return -1
+
+        (rowNum, colNum) = self.m_levelDims[level]
+        if row < 0 or row >= rowNum or col < 0 or col >= colNum:
+            return -1
+
+        return self.m_levelOffsets[level] + row * colNum + col
+
+
+
+    def coordOf(self, cellId:int)->Coordinates3D:
+        """
+        Maps a cell id back to its coordinates.  Inverse of cellId().
+
+        @param cellId: Id of the cell.
+
+        @returns Coordinates of the cell.
+        """
+        assert(cellId >= 0 and cellId < self.m_levelOffsets[-1])
+
+        level = bisect_right(self.m_levelOffsets, cellId) - 1
+        (row, col) = divmod(cellId - self.m_levelOffsets[level], self.m_levelDims[level][self.LevelDimsIndex.COL_NUM.value])
+        return Coordinates3D(level, row, col)
+
+
+
+    def idNeighbours(self, cellId:int)->List[int]:
+        """
+        Retrieves the ids of the interior cells adjacent to a cell, regardless of walls.  They are listed in the
+        same order as neighbours() lists them.
+
+        @param cellId: Id of the cell to find the neighbours for.
+
+        @returns List of ids of the neighbouring interior cells.
+        """
+        coord = self.coordOf(cellId)
+        level: int = coord.getLevel()
+        row: int = coord.getRow()
+        col: int = coord.getCol()
+        (rowNum, colNum) = self.m_levelDims[level]
+
+        neighs: List[int] = list()
+        # same level: left, right, below, above
+        if col > 0:
+            neighs.append(cellId - 1)
+        if col < colNum - 1:
+            neighs.append(cellId + 1)
+        if row > 0:
+            neighs.append(cellId - colNum)
+        if row < rowNum - 1:
+            neighs.append(cellId + colNum)
+        # level below, then level above, if there is a cell there
+        for adjLevel in (level - 1, level + 1):
+            if adjLevel >= 0 and adjLevel < len(self.m_levelDims):
+                (adjRowNum, adjColNum) = self.m_levelDims[adjLevel]
+                if row < adjRowNum and col < adjColNum:
+                    neighs.append(self.m_levelOffsets[adjLevel] + row * adjColNum + col)
+
+        return neighs
+
+
+
+    def idNeighbourTable(self)->Tuple[array, bytearray]:
+        """
+        Tabulates idNeighbours() for all cells, for generators and solvers that work on cell ids in tight loops.  The
+        table is computed once per maze and shared, so it must not be modified.
+
+        @returns Tuple of the neighbour table and the degrees.  The neighbour table is a flat array of
+            WALL_DIRECTION_NUM entries per cell: the neighbours of cell id are at [id * WALL_DIRECTION_NUM + k] for k
+            from 0 to degrees[id]-1, in the order of idNeighbours(), and the remaining entries are -1.
+        """
+        if self.m_idNeighbourTable is not None:
+            return self.m_idNeighbourTable
+
+        cellNum = self.m_levelOffsets[-1]
+        table = array('q', [-1]) * (cellNum * self.WALL_DIRECTION_NUM)
+        degrees = bytearray(cellNum)
+
+        if np is None:
+            for cellId in range(0, cellNum):
+                neighs = self.idNeighbours(cellId)
+                table[cellId * self.WALL_DIRECTION_NUM:cellId * self.WALL_DIRECTION_NUM + len(neighs)] = array('q', neighs)
+                degrees[cellId] = len(neighs)
+        else:
+            # ids of the cells of a level, as a (rowNum, colNum) grid
+            levelIds = lambda level: np.arange(self.m_levelOffsets[level], self.m_levelOffsets[level + 1],
+                                               dtype=np.int64).reshape(self.m_levelDims[level])
+
+            candidates = np.full((cellNum, self.WALL_DIRECTION_NUM), -1, dtype=np.int64)
+            for level, (rowNum, colNum) in enumerate(self.m_levelDims):
+                ids = levelIds(level)
+                levelCandidates = candidates[self.m_levelOffsets[level]:self.m_levelOffsets[level + 1]].reshape(rowNum, colNum, -1)
+                # same level: left, right, below, above
+                levelCandidates[:, 1:, 0] = ids[:, :-1]
+                levelCandidates[:, :-1, 1] = ids[:, 1:]
+                levelCandidates[1:, :, 2] = ids[:-1, :]
+                levelCandidates[:-1, :, 3] = ids[1:, :]
+                # level below, then level above, if there is a cell there
+                for (adjLevel, k) in ((level - 1, 4), (level + 1, 5)):
+                    if adjLevel >= 0 and adjLevel < len(self.m_levelDims):
+                        (adjRowNum, adjColNum) = self.m_levelDims[adjLevel]
+                        (sharedRowNum, sharedColNum) = (min(rowNum, adjRowNum), min(colNum, adjColNum))
+                        levelCandidates[:sharedRowNum, :sharedColNum, k] = levelIds(adjLevel)[:sharedRowNum, :sharedColNum]
+
+            # move the existing neighbours to the front, keeping their order
+            valid = candidates >= 0
+            candidates = np.take_along_axis(candidates, np.argsort(~valid, axis=1, kind='stable'), axis=1)
+            table = array('q', candidates.tobytes())
+            degrees = bytearray(valid.sum(axis=1).astype(np.uint8).tobytes())
+
+        self.m_idNeighbourTable = (table, degrees)
+        return self.m_idNeighbourTable
+
+
+
+    def idHasWall(self, cellId1:int, cellId2:int)->bool:
+        """
+        Checks if there is a wall between two cells given by their ids.
+
+        @param cellId1: Id of one side of wall.
+        @param cellId2: Id of other side of wall.
+
+        @returns True, if there is a wall between the two specified cells.
+        """
+        return self.hasWall(self.coordOf(cellId1), self.coordOf(cellId2))
+
+
+
+    def wallId(self, cell1:Coordinates3D, cell2:Coordinates3D)->int:
+        """
+        Maps a wall to its integer id, cellId * WALL_DIRECTION_NUM + direction (see WallDirection).  Each wall has a
+        single canonical id: a wall between two interior cells is identified from the lower cell with a plus
+        direction, and a wall between an interior cell and a boundary vertex is identified from the interior cell.
+
+        @param cell1: One side of wall.
+        @param cell2: Other side of wall.
+
+        @returns Id of the wall, or -1 if cell1 and cell2 are not adjacent or neither is an interior cell.
+        """
+        id1 = self.cellId(cell1)
+        id2 = self.cellId(cell2)
+
+        # identify the wall from the lower cell, or from the only interior one
+        if id1 < 0 or (id2 >= 0 and id2 < id1):
+            (cell1, cell2) = (cell2, cell1)
+            (id1, id2) = (id2, id1)
+        if id1 < 0:
+            return -1
+
+        offset = (cell2.getLevel() - cell1.getLevel(), cell2.getRow() - cell1.getRow(), cell2.getCol() - cell1.getCol())
+        if offset not in self.WALL_OFFSETS:
+            return -1
+        direction = self.WALL_OFFSETS.index(offset)
+
+        # there are no walls above the top level or below the bottom level
+        if cell2.getLevel() < 0 or cell2.getLevel() >= len(self.m_levelDims):
+            return -1
+
+        return id1 * self.WALL_DIRECTION_NUM + direction
+
+
+
+    def wallCoordsOf(self, wallId:int)->WallCoordinates:
+        """
+        Maps a wall id back to the cells on either side of the wall.  Inverse of wallId().
+
+        @param wallId: Id of the wall.
+
+        @returns Coordinates of the wall.
+        """
+        (cellId, direction) = divmod(wallId, self.WALL_DIRECTION_NUM)
+        cell = self.coordOf(cellId)
+        (levelOffset, rowOffset, colOffset) = self.WALL_OFFSETS[direction]
+        return WallCoordinates(cell, Coordinates3D(cell.getLevel() + levelOffset, cell.getRow() + rowOffset, cell.getCol() + colOffset))
+
+
+
+    def wallIds(self, interiorOnly:bool = False)->List[int]:
+        """
+        Enumerates the ids of all the walls (edges) of the maze, whether there is currently a wall there or not.
+
+        @param interiorOnly: Whether to only include walls between two interior cells, i.e., leave out the walls
+            along the boundary of the maze and above/below cells that have no cell on the adjacent level.
+            Default is False.
+
+        @returns List of wall ids, in increasing order.
+        """
+        wallIds: List[int] = list()
+        levelNum = len(self.m_levelDims)
+
+        for level, (rowNum, colNum) in enumerate(self.m_levelDims):
+            (lowerRowNum, lowerColNum) = self.m_levelDims[level - 1] if level > 0 else (0, 0)
+            (upperRowNum, upperColNum) = self.m_levelDims[level + 1] if level < levelNum - 1 else (0, 0)
+
+            for row in range(0, rowNum):
+                for col in range(0, colNum):
+                    base = (self.m_levelOffsets[level] + row * colNum + col) * self.WALL_DIRECTION_NUM
+                    hasUpperCell = row < upperRowNum and col < upperColNum
+
+                    if not interiorOnly or row < rowNum - 1:
+                        wallIds.append(base + self.WallDirection.PLUS_ROW.value)
+                    if not interiorOnly or col < colNum - 1:
+                        wallIds.append(base + self.WallDirection.PLUS_COL.value)
+                    if level < levelNum - 1 and (not interiorOnly or hasUpperCell):
+                        wallIds.append(base + self.WallDirection.PLUS_LEVEL.value)
+
+                    if not interiorOnly:
+                        if row == 0:
+                            wallIds.append(base + self.WallDirection.MINUS_ROW.value)
+                        if col == 0:
+                            wallIds.append(base + self.WallDirection.MINUS_COL.value)
+                        if level > 0 and not (row < lowerRowNum and col < lowerColNum):
+                            wallIds.append(base + self.WallDirection.MINUS_LEVEL.value)
+
+        return wallIds
+
+
+
+    def hasWallId(self, wallId:int)->bool:
+        """
+        Checks if there is a wall at the given wall id.
+
+        @param wallId: Id of the wall.
+
+        @returns True, if there is a wall.
+        """
+        wall = self.wallCoordsOf(wallId)
+        return self.hasWall(wall.getFirst(), wall.getSecond())
+
+
+
+    def setWallId(self, wallId:int, wallStatus:bool)->bool:
+        """
+        Adds or removes the wall at the given wall id.
+
+        @param wallId: Id of the wall.
+        @param wallStatus: True to add the wall, False to remove it.
+
+        @returns True if the wall was updated, otherwise False (e.g., it isn't a wall of the maze).
+        """
+        wall = self.wallCoordsOf(wallId)
+        if self.m_lazyPending:
+            self._buildLevels(wall.getFirst(), wall.getSecond())
+        self.m_passable = None
+        return self.m_graph.updateWall(wall.getFirst(), wall.getSecond(), wallStatus)
+
+
+
+    def toggleWallId(self, wallId:int)->bool:
+        """
+        Removes the wall at the given wall id if there is one, otherwise adds it.
+
+        @param wallId: Id of the wall.
+
+        @returns The new wall status, True if there is now a wall.
+        """
+        wallStatus = not self.hasWallId(wallId)
+        self.setWallId(wallId, wallStatus)
+        return wallStatus
+
+
+
+    def save(self, path: str):
+        """
+        Saves the maze (levels, entrances, exits and walls) to a binary maze file, see maze/mazeFile.py for the
+        format.  The walls are saved as they are, so carve the entrances and exits first if they should be open.
+
+        @param path: Path of the file to write.
+        """
+        assert(mazeFile is not None)
+        if self.m_lazyPending:
+            self.buildAllLevels()
+        mazeFile.writeMazeFile(path, self.m_levelDims, self.m_entrance, self.m_exit, self.m_graph)
+
+
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True)->'Maze3D':
+        """
+        Opens a maze saved with save().  Memory-mapped mazes keep the file open until close() is called, so use the
+        maze as a context manager:
+
+            with Maze3D.open(path) as maze:
+                solver.solveMaze(maze, maze.getEntrances()[0])
+
+        @param path: Path of the maze file.
+        @param mmap: Whether to read the walls through a read-only memory map of the file, so that mazes larger than
+            memory can be solved and the file shared between processes.  Otherwise the walls are loaded into a
+            GridGraph and can be modified.  Default is True.
+
+        @returns The maze stored in the file.
+        """
+        assert(mazeFile is not None)
+        (levelDims, entrances, exits, graph) = mazeFile.readMazeFile(path, mmap)
+
+        try:
+            maze = cls(levelDims, graph)
+        except BaseException:
+            graph.close()
+            raise
+        maze.m_entrance = entrances
+        maze.m_exit = exits
+        # the file holds every level, as if initCells() had been called
+        maze.m_levelBuilt = [True] * len(levelDims)
+        maze.m_levelLinksBuilt = [True] * max(0, len(levelDims) - 1)
+        maze.m_lazyPending = False
+        return maze
+
+
+
+    def close(self):
+        """
+        Releases the resources held by the maze's graph, e.g., the file and memory map of a maze opened with open().
+        The maze can't be used afterwards if it was memory-mapped.
+        """
+        self.m_graph.close()
+
+
+
+    def __enter__(self)->'Maze3D':
+        return self
+
+
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+
+    def touchedLevels(self)->List[int]:
+        """
+        @returns The levels that have been built.  For lazy mazes, these are the levels that have been accessed so far
+            (and the ones next to them that only have their links built are not included), otherwise all levels once
+            initCells() has been called.
+        """
+        return [level for (level, built) in enumerate(self.m_levelBuilt) if built]
+
+
+
+    def _buildLevels(self, *cells: Coordinates3D):
+        """
+        For lazy mazes, builds the levels of the given cells, if not built yet.
+
+        @param cells: Cells whose levels are being accessed.
+        """
+        self._buildLevelNums([cell.getLevel() for cell in cells])
+
+
+
+    def _buildLevelNums(self, levels):
+        """
+        For lazy mazes, builds the given levels, if not built yet.  Levels out of range are ignored.
+
+        @param levels: Iterable of levels being accessed.
+        """
+        for level in levels:
+            if level >= 0 and level < len(self.m_levelDims) and not self.m_levelBuilt[level]:
+                self._buildLevel(level)
+
+
+
+    def _buildLevel(self, level: int):
+        """
+        For lazy mazes, builds a level: its cells and the walls between them, and the links to the levels below and
+        above it.  If the graph can't build levels on their own, all the levels are built at once instead.
+
+        @param level: Level to build.
+        """
+        self.m_levelBuilt[level] = True
+
+        if not self.m_graph.buildLevel(self.m_levelDims, level, self.m_lazyWallFlag):
+            self.m_lazy = False
+            self.m_lazyPending = False
+            self.initCells(self.m_lazyWallFlag)
+            return
+
+        for lowerLevel in (level - 1, level):
+            if lowerLevel >= 0 and lowerLevel < len(self.m_levelLinksBuilt) and not self.m_levelLinksBuilt[lowerLevel]:
+                self.m_levelLinksBuilt[lowerLevel] = True
+                self.m_graph.buildLevelLinks(self.m_levelDims, lowerLevel, self.m_lazyWallFlag)
+
+        self.m_lazyPending = not all(self.m_levelBuilt)
+
+
+
+    def buildAllLevels(self):
+        """
+        For lazy mazes, builds all the levels not built yet.
+        """
+        for level in range(0, len(self.m_levelDims)):
+            if not self.m_levelBuilt[level]:
+                self._buildLevel(level)
+
+
+
+    def _levelVertices(self, level: int)->List[Coordinates3D]:
+        """
+        @returns The interior cells of a level, row by row, followed by its boundary cells, as added by initCells().
+        """
+        (rowNum, colNum) = self.m_levelDims[level]
+        return [Coordinates3D(level, r, c) for r in range(0, rowNum) for c in range(0, colNum)] + \
+               [Coordinates3D(level, -1, c) for c in range(0, colNum)] + \
+               [Coordinates3D(level, r, -1) for r in range(0, rowNum)] + \
+               [Coordinates3D(level, rowNum, c) for c in range(0, colNum)] + \
+               [Coordinates3D(level, r, colNum) for r in range(0, rowNum)]
+
+
+
+    def _idCoords(self, cellIds)->'np.ndarray':
+        """
+        Vectorised version of coordOf().
+
+        @param cellIds: Integer array of cell ids, of any shape.
+
+        @returns Integer array of the (level, row, col) of each cell, with an extra last axis of size 3.
+        """
+        cellIds = np.asarray(cellIds, dtype=np.int64)
+        assert(cellIds.size == 0 or (cellIds.min() >= 0 and cellIds.max() < self.m_levelOffsets[-1]))
+
+        offsets = np.array(self.m_levelOffsets, dtype=np.int64)
+        colNums = np.array([colNum for (_, colNum) in self.m_levelDims], dtype=np.int64)
+        levels = np.searchsorted(offsets, cellIds, side='right') - 1
+        (rows, cols) = np.divmod(cellIds - offsets[levels], colNums[levels])
+        return np.stack([levels, rows, cols], axis=-1)
+
+
+
+    def _batchPairs(self, pairs):
+        """
+        Prepares the pairs passed to a batch method for the graph: cell ids are converted to coordinates, and the
+        levels of lazy mazes built.
+
+        @param pairs: Sequence of (cell1, cell2) pairs of Coordinates3D, integer array of shape (n, 2) of pairs of
+            cell ids, or integer array of shape (n, 2, 3) of (level, row, col).
+
+        @returns Pairs as accepted by the batch methods of Graph.
+        """
+        if np is not None and isinstance(pairs, np.ndarray):
+            if pairs.ndim == 2:
+                pairs = self._idCoords(pairs)
+            if self.m_lazyPending:
+                self._buildLevelNums(np.unique(pairs[..., 0]).tolist())
+        else:
+            pairs = list(pairs)
+            if self.m_lazyPending:
+                self._buildLevelNums({cell.getLevel() for pair in pairs for cell in pair})
+
+        return pairs
+
+
+
+    def _batchCells(self, cells):
+        """
+        Prepares the cells passed to a batch method for the graph, building the levels of lazy mazes.
+
+        @param cells: Sequence of Coordinates3D, or integer array of shape (n, 3) of (level, row, col).
+
+        @returns Cells as accepted by the batch methods of Graph.
+        """
+        if np is not None and isinstance(cells, np.ndarray):
+            if self.m_lazyPending:
+                self._buildLevelNums(np.unique(cells[..., 0]).tolist())
+        else:
+            cells = list(cells)
+            if self.m_lazyPending:
+                self._buildLevelNums({cell.getLevel() for cell in cells})
+
+        return cells
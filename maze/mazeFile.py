@@ -0,0 +1,265 @@
+import mmap
+import struct
+from typing import BinaryIO, List, Tuple
+
+import numpy as np
+
+from maze.util import Coordinates3D
+from maze.graph import Graph
+from maze.gridGraph import GridGraph
+
+
+# Binary maze file format, all values little endian:
+#   header, as written by packHeader(): magic, version, reserved, number of levels, number of entrances, number of
+#       exits, then the level dimensions, (rowNum, colNum) as int32 for each level, and the entrances, then exits,
+#       (level, row, col) as int32 for each
+#   padding up to a multiple of 8 bytes
+#   walls: the GridGraph wall slots packed into bits, least significant bit first.  Each level starts on a byte
+#       boundary, so the walls of a level can be read without touching the rest of the file.
+MAZE_FILE_MAGIC = b'MZ3D'
+MAZE_FILE_VERSION = 1
+# Fixed part of the header shared by the maze formats: magic, version, reserved, levels, entrances, exits.
+HEADER_STRUCT = struct.Struct('<4sHHIII')
+
+
+
+class MmapGridGraph(GridGraph):
+    """
+    Read-only GridGraph whose walls are read through a memory map of a maze file, rather than loaded into memory.
+    Only the pages that are accessed are read from disk, and the same file can be shared by many processes.
+    """
+
+    def __init__(self, path: str, levelDims: List[Tuple[int, int]], dataOffset: int):
+        """
+        Constructor.
+
+        @param path: Path of the maze file.
+        @param levelDims: (rowNum, colNum) of each level, as stored in the file.
+        @param dataOffset: Offset in bytes of the packed walls in the file.
+        """
+        super().__init__()
+        # number of wall slots, the packed walls take an eighth of this in bytes
+        self.m_slotNum: int = self._layout(levelDims)
+
+        self.m_file = open(path, 'rb')
+        self.m_mmap = mmap.mmap(self.m_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.m_dataOffset: int = dataOffset
+
+
+
+    def buildGrid(self, levelDims: List[Tuple[int, int]], addWall: bool = False)->bool:
+        # the grid is the one in the file, which can't be rebuilt
+        return [(rowNum, colNum) for (rowNum, colNum) in levelDims] == self.m_levelDims
+
+
+
+    def updateWall(self, vert1:Coordinates3D, vert2:Coordinates3D, wallStatus:bool)->bool:
+        # the file is mapped read-only
+        return False
+
+
+
+    def getWallStatus(self, vert1:Coordinates3D, vert2:Coordinates3D)->bool:
+
+        slot = self._wallSlot(vert1, vert2)
+        if slot < 0:
+            return False
+
+        return (self.m_mmap[self.m_dataOffset + (slot >> 3)] >> (slot & 7)) & 1 == 1
+
+
+
+    def _slotWallStatuses(self, slots: np.ndarray)->np.ndarray:
+
+        walls = np.frombuffer(self.m_mmap, dtype=np.uint8, offset=self.m_dataOffset)
+        safeSlots = np.maximum(slots, 0)
+        return (slots >= 0) & ((walls[safeSlots >> 3] >> (safeSlots & 7)) & 1 == 1)
+
+
+
+    def _updateWalls(self, pairs, wallStatus: bool)->int:
+        # the file is mapped read-only
+        return 0
+
+
+
+    def __getstate__(self)->dict:
+        """
+        Pickles the walls packed into bits, as GridGraph does, copying them out of the memory map.
+        """
+        return {'levelDims': self.m_levelDims,
+                'walls': self.m_mmap[self.m_dataOffset:self.m_dataOffset + self.m_slotNum // 8]}
+
+
+
+    def __reduce__(self):
+        """
+        Unpickles as an in-memory GridGraph, e.g., in the worker processes of a pool, as the file may not be there.
+        """
+        return (GridGraph, (), self.__getstate__())
+
+
+
+    def close(self):
+        """
+        Closes the memory map and the underlying file.  Closing again does nothing.
+        """
+        if not self.m_mmap.closed:
+            self.m_mmap.close()
+        self.m_file.close()
+
+
+
+def packHeader(magic: bytes, version: int, levelDims: List[Tuple[int, int]], entrances: List[Coordinates3D],
+               exits: List[Coordinates3D])->bytearray:
+    """
+    Packs the header shared by the maze formats: the fixed part, the level dimensions, then the entrances and exits.
+
+    @param magic: 4 byte magic of the format.
+    @param version: Version of the format.
+    @param levelDims: (rowNum, colNum) of each level.
+    @param entrances: Entrances of the maze.
+    @param exits: Exits of the maze.
+
+    @returns The packed header.
+    """
+    header = bytearray(HEADER_STRUCT.pack(magic, version, 0, len(levelDims), len(entrances), len(exits)))
+    for (rowNum, colNum) in levelDims:
+        header += struct.pack('<ii', rowNum, colNum)
+    for cell in list(entrances) + list(exits):
+        header += struct.pack('<iii', cell.getLevel(), cell.getRow(), cell.getCol())
+
+    return header
+
+
+
+def readHeader(stream: BinaryIO, magic: bytes, version: int, formatName: str)->Tuple[List[Tuple[int, int]], List[Coordinates3D], List[Coordinates3D]]:
+    """
+    Reads a header written by packHeader(), leaving the stream just after it.
+
+    @param stream: Binary file object to read from.
+    @param magic: Magic the format expects.
+    @param version: Version the format expects.
+    @param formatName: Name of the format, for error messages.
+
+    @returns Tuple of the level dimensions, entrances and exits.
+    """
+    (fileMagic, fileVersion, _, levelNum, entranceNum, exitNum) = HEADER_STRUCT.unpack(stream.read(HEADER_STRUCT.size))
+    if fileMagic != magic:
+        raise ValueError('Not a {}.'.format(formatName))
+    if fileVersion != version:
+        raise ValueError('Unsupported {} version {}.'.format(formatName, fileVersion))
+
+    dims = struct.unpack('<{}i'.format(2 * levelNum), stream.read(8 * levelNum))
+    levelDims = [(dims[2 * i], dims[2 * i + 1]) for i in range(0, levelNum)]
+    cells = struct.unpack('<{}i'.format(3 * (entranceNum + exitNum)), stream.read(12 * (entranceNum + exitNum)))
+    cells = [Coordinates3D(cells[3 * i], cells[3 * i + 1], cells[3 * i + 2]) for i in range(0, entranceNum + exitNum)]
+
+    return (levelDims, cells[:entranceNum], cells[entranceNum:])
+
+
+
+def levelWallArrays(levelDims: List[Tuple[int, int]], graph: Graph, level: int)->Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Retrieves the walls of one level of a graph, as the column, row and level wall arrays of the GridGraph layout.
+
+    @param levelDims: (rowNum, colNum) of each level.
+    @param graph: Graph to retrieve the walls of, which can be any backend.
+    @param level: Level to retrieve the walls of.
+
+    @returns Tuple of the column, row and level (to the level above) wall arrays, 1 where there is a wall.  These are
+        views into the graph for a GridGraph, otherwise new arrays.
+    """
+    if type(graph) is GridGraph and graph.m_levelDims == [(rowNum, colNum) for (rowNum, colNum) in levelDims]:
+        return (graph.m_colWalls[level], graph.m_rowWalls[level], graph.m_levelWalls[level])
+
+    # other backends, ask for every wall
+    (rowNum, colNum) = levelDims[level]
+    (colWallShape, rowWallShape, levelWallShape) = GridGraph.wallShapes(levelDims, level)
+    colWalls = np.zeros(colWallShape, dtype=np.uint8)
+    rowWalls = np.zeros(rowWallShape, dtype=np.uint8)
+    levelWalls = np.zeros(levelWallShape, dtype=np.uint8)
+
+    for r in range(0, rowNum):
+        for c in range(-1, colNum):
+            colWalls[r, c + 1] = graph.getWallStatus(Coordinates3D(level, r, c), Coordinates3D(level, r, c + 1))
+    for c in range(0, colNum):
+        for r in range(-1, rowNum):
+            rowWalls[r + 1, c] = graph.getWallStatus(Coordinates3D(level, r, c), Coordinates3D(level, r + 1, c))
+    for r in range(0, levelWallShape[0]):
+        for c in range(0, levelWallShape[1]):
+            levelWalls[r, c] = graph.getWallStatus(Coordinates3D(level, r, c), Coordinates3D(level + 1, r, c))
+
+    return (colWalls, rowWalls, levelWalls)
+
+
+
+def wallArray(levelDims: List[Tuple[int, int]], graph: Graph)->np.ndarray:
+    """
+    Retrieves the walls of a graph in the GridGraph layout.
+
+    @param levelDims: (rowNum, colNum) of each level.
+    @param graph: Graph to retrieve the walls of, which can be any backend.
+
+    @returns Array of one byte per wall slot, 1 if there is a wall.
+    """
+    if type(graph) is GridGraph and graph.m_levelDims == [(rowNum, colNum) for (rowNum, colNum) in levelDims]:
+        return np.frombuffer(graph.m_walls, dtype=np.uint8)
+
+    grid = GridGraph()
+    grid.buildGrid(levelDims)
+    for level in range(0, len(levelDims)):
+        (colWalls, rowWalls, levelWalls) = levelWallArrays(levelDims, graph, level)
+        grid.m_colWalls[level][:] = colWalls
+        grid.m_rowWalls[level][:] = rowWalls
+        grid.m_levelWalls[level][:] = levelWalls
+
+    return np.frombuffer(grid.m_walls, dtype=np.uint8)
+
+
+
+def writeMazeFile(path: str, levelDims: List[Tuple[int, int]], entrances: List[Coordinates3D],
+                  exits: List[Coordinates3D], graph: Graph):
+    """
+    Writes a maze to a binary maze file.
+
+    @param path: Path of the file to write.
+    @param levelDims: (rowNum, colNum) of each level.
+    @param entrances: Entrances of the maze.
+    @param exits: Exits of the maze.
+    @param graph: Graph storing the walls of the maze.
+    """
+    header = packHeader(MAZE_FILE_MAGIC, MAZE_FILE_VERSION, levelDims, entrances, exits)
+    header += bytes(-len(header) % 8)
+
+    with open(path, 'wb') as mazeFile:
+        mazeFile.write(header)
+        mazeFile.write(np.packbits(wallArray(levelDims, graph), bitorder='little').tobytes())
+
+
+
+def readMazeFile(path: str, useMmap: bool = True)->Tuple[List[Tuple[int, int]], List[Coordinates3D], List[Coordinates3D], Graph]:
+    """
+    Reads a binary maze file.
+
+    @param path: Path of the file to read.
+    @param useMmap: Whether to read the walls through a memory map (read-only), or load them into memory.
+        Default is True.
+
+    @returns Tuple of the level dimensions, entrances, exits and the graph storing the walls.
+    """
+    with open(path, 'rb') as mazeFile:
+        (levelDims, entrances, exits) = readHeader(mazeFile, MAZE_FILE_MAGIC, MAZE_FILE_VERSION, 'maze file')
+        dataOffset = mazeFile.tell()
+        dataOffset += -dataOffset % 8
+
+        if useMmap:
+            graph = MmapGridGraph(path, levelDims, dataOffset)
+        else:
+            graph = GridGraph()
+            graph.buildGrid(levelDims)
+            mazeFile.seek(dataOffset)
+            packed = np.frombuffer(mazeFile.read(len(graph.m_walls) // 8), dtype=np.uint8)
+            np.frombuffer(graph.m_walls, dtype=np.uint8)[:] = np.unpackbits(packed, bitorder='little')
+
+    return (levelDims, entrances, exits, graph)
@@ -0,0 +1,221 @@
+import zlib
+from typing import BinaryIO, List, Tuple
+
+import numpy as np
+
+from maze.util import Coordinates3D
+from maze.graph import Graph
+from maze.gridGraph import GridGraph
+from maze.maze3D import Maze3D
+from maze.mazeFile import levelWallArrays, packHeader, readHeader
+
+
+# Streaming compressed maze format, all values little endian:
+#   header, as written by mazeFile.packHeader(): magic, version, reserved, number of levels, number of entrances,
+#       number of exits, then the level dimensions and the entrances, then exits, as for the binary maze file
+#   then one zlib stream per level, holding one byte per wall (1 if there is a wall), in row order:
+#       the walls below row 0, then for each row r, the walls between its columns (left boundary first) followed by
+#       the walls between row r and row r+1, and finally the walls between this level and the one above it.
+# Each zlib stream ends itself, so a level can be written row by row without knowing its compressed size.
+MAZE_STREAM_MAGIC = b'MZ3S'
+MAZE_STREAM_VERSION = 1
+
+# Size of the blocks read from the file when decompressing.
+READ_BLOCK_SIZE = 1 << 16
+
+
+
+class MazeStreamWriter:
+    """
+    Writes a maze level by level, each level compressed on its own, so that only one level of walls needs to be held
+    in memory at a time.  A level can be written whole with writeLevel(), or in pieces, in the order of the format,
+    with beginLevel(), writeLevelData() and endLevel().
+    """
+
+    def __init__(self, stream: BinaryIO, levelDims: List[Tuple[int, int]], entrances: List[Coordinates3D],
+                 exits: List[Coordinates3D], compressLevel: int = 6):
+        """
+        Constructor.  Writes the header.
+
+        @param stream: Binary file object to write to.
+        @param levelDims: (rowNum, colNum) of each level.
+        @param entrances: Entrances of the maze.
+        @param exits: Exits of the maze.
+        @param compressLevel: zlib compression level.  Default is 6.
+        """
+        self.m_stream: BinaryIO = stream
+        self.m_levelDims: List[Tuple[int, int]] = [(rowNum, colNum) for (rowNum, colNum) in levelDims]
+        self.m_compressLevel: int = compressLevel
+        # level being written and its compressor, or None if not in a level
+        self.m_level: int = -1
+        self.m_compressor = None
+
+        self.m_stream.write(packHeader(MAZE_STREAM_MAGIC, MAZE_STREAM_VERSION, self.m_levelDims, entrances, exits))
+
+
+
+    def beginLevel(self, level: int):
+        """
+        Starts writing the next level.  Levels must be written in order.
+
+        @param level: Level to write.
+        """
+        assert(self.m_compressor is None and level == self.m_level + 1 and level < len(self.m_levelDims))
+        self.m_level = level
+        self.m_compressor = zlib.compressobj(self.m_compressLevel)
+
+
+
+    def writeLevelData(self, walls):
+        """
+        Writes the next walls of the current level, in the order of the format.
+
+        @param walls: Bytes or uint8 array of walls, 1 where there is a wall.
+        """
+        assert(self.m_compressor is not None)
+        self.m_stream.write(self.m_compressor.compress(bytes(walls)))
+
+
+
+    def endLevel(self):
+        """
+        Finishes writing the current level.
+        """
+        assert(self.m_compressor is not None)
+        self.m_stream.write(self.m_compressor.flush())
+        self.m_compressor = None
+
+
+
+    def writeLevel(self, level: int, colWalls: np.ndarray, rowWalls: np.ndarray, levelWalls: np.ndarray):
+        """
+        Writes a whole level.
+
+        @param level: Level to write.
+        @param colWalls: Column walls of the level, in the GridGraph layout.
+        @param rowWalls: Row walls of the level, in the GridGraph layout.
+        @param levelWalls: Walls between the level and the level above, in the GridGraph layout.
+        """
+        self.beginLevel(level)
+        self.writeLevelData(np.ascontiguousarray(rowWalls[0], dtype=np.uint8))
+        self.writeLevelData(np.ascontiguousarray(np.concatenate([colWalls, rowWalls[1:]], axis=1), dtype=np.uint8))
+        self.writeLevelData(np.ascontiguousarray(levelWalls, dtype=np.uint8))
+        self.endLevel()
+
+
+
+class MazeStreamReader:
+    """
+    Reads a maze written by MazeStreamWriter, level by level.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Constructor.  Reads the header.
+
+        @param stream: Binary file object to read from.
+        """
+        self.m_stream: BinaryIO = stream
+
+        (levelDims, entrances, exits) = readHeader(stream, MAZE_STREAM_MAGIC, MAZE_STREAM_VERSION, 'maze stream')
+        self.m_levelDims: List[Tuple[int, int]] = levelDims
+        self.m_entrances: List[Coordinates3D] = entrances
+        self.m_exits: List[Coordinates3D] = exits
+
+        # next level to read, and compressed data read past the end of the previous level
+        self.m_level: int = 0
+        self.m_pending: bytes = b''
+
+
+
+    def readLevel(self)->Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reads the next level.
+
+        @returns Tuple of the level, and its column, row and level wall arrays in the GridGraph layout.
+        """
+        assert(self.m_level < len(self.m_levelDims))
+        level = self.m_level
+
+        decompressor = zlib.decompressobj()
+        chunks = list()
+        data = self.m_pending
+        while not decompressor.eof:
+            if not data:
+                data = self.m_stream.read(READ_BLOCK_SIZE)
+                if not data:
+                    raise ValueError('Maze stream ends in the middle of level {}.'.format(level))
+            chunks.append(decompressor.decompress(data))
+            data = b''
+        self.m_pending = decompressor.unused_data
+        self.m_level += 1
+
+        walls = np.frombuffer(b''.join(chunks), dtype=np.uint8)
+        (colWallShape, rowWallShape, levelWallShape) = GridGraph.wallShapes(self.m_levelDims, level)
+        (rowNum, colNum) = self.m_levelDims[level]
+
+        rowWalls = np.empty(rowWallShape, dtype=np.uint8)
+        rowWalls[0] = walls[:colNum]
+        rowBlocks = walls[colNum:colNum + rowNum * (2 * colNum + 1)].reshape(rowNum, 2 * colNum + 1)
+        colWalls = rowBlocks[:, :colNum + 1]
+        rowWalls[1:] = rowBlocks[:, colNum + 1:]
+        levelWalls = walls[colNum + rowNum * (2 * colNum + 1):].reshape(levelWallShape)
+
+        return (level, colWalls, rowWalls, levelWalls)
+
+
+
+def writeMaze(maze: Maze3D, path: str, compressLevel: int = 6):
+    """
+    Writes a maze to a streaming compressed maze file, one level at a time.
+
+    @param maze: Maze to write.
+    @param path: Path of the file to write.
+    @param compressLevel: zlib compression level.  Default is 6.
+    """
+    with open(path, 'wb') as stream:
+        if maze.m_lazyPending:
+            maze.buildAllLevels()
+        writer = MazeStreamWriter(stream, maze.m_levelDims, maze.getEntrances(), maze.getExits(), compressLevel)
+        for level in range(0, maze.levelNum()):
+            writer.writeLevel(level, *levelWallArrays(maze.m_levelDims, maze.m_graph, level))
+
+
+
+def readMaze(path: str, graph: Graph = None)->Maze3D:
+    """
+    Reads a maze from a streaming compressed maze file.
+
+    @param path: Path of the file to read.
+    @param graph: Graph to store the maze in.  Default is None, which uses a GridGraph, where each level is copied in
+        as a whole.  Other backends have the walls of each level added in one batch.
+
+    @returns The maze stored in the file.
+    """
+    with open(path, 'rb') as stream:
+        reader = MazeStreamReader(stream)
+
+        maze = Maze3D(reader.m_levelDims, graph if graph is not None else GridGraph())
+        maze.initCells(False)
+        maze.m_entrance = reader.m_entrances
+        maze.m_exit = reader.m_exits
+
+        for _ in range(0, maze.levelNum()):
+            (level, colWalls, rowWalls, levelWalls) = reader.readLevel()
+
+            if type(maze.m_graph) is GridGraph:
+                maze.m_graph.m_colWalls[level][:] = colWalls
+                maze.m_graph.m_rowWalls[level][:] = rowWalls
+                maze.m_graph.m_levelWalls[level][:] = levelWalls
+            else:
+                # (level, row, col) offsets of the two cells of a wall from its position in each array
+                pairs = list()
+                for (walls, firstOffset, secondOffset) in [(colWalls, (0, 0, -1), (0, 0, 0)),
+                                                           (rowWalls, (0, -1, 0), (0, 0, 0)),
+                                                           (levelWalls, (0, 0, 0), (1, 0, 0))]:
+                    (rows, cols) = np.nonzero(walls)
+                    cells = np.stack([np.full_like(rows, level), rows, cols], axis=1).astype(np.int64)
+                    pairs.append(np.stack([cells + firstOffset, cells + secondOffset], axis=1))
+                maze.addWalls(np.concatenate(pairs))
+
+    return maze
@@ -1,3 +1,6 @@
+from typing import List, Tuple
+
+
 class Coordinates3D:
     """
     Forward declaration.
@@ -13,29 +16,43 @@ class Coordinates3D:
 
 
 
-class Coordinates3D:
+class Coordinates3D(tuple):
     """
     Represent 3D coordinates for maze cells.
     Note this is not exactly the same as Coordinate from Assignment 1.
+
+    Coordinates are an immutable (level, row, col) tuple without a per-instance dictionary.  Hashing, equality and
+    ordering are therefore the tuple ones, computed in C from the three integers, which keeps the sets and
+    dictionaries of coordinates used by the generators and solvers fast.
     """
 
-    def __init__(self, level: int, row:int, col:int):
+    __slots__ = ()
+
+    def __new__(cls, level: int, row:int, col:int):
         """
         Constructor.
         
+        @param level: Level of coordinates.
         @param row: Row of coordinates.
         @param col: Column of coordinates.
         """
-        self.m_level: int = level
-        self.m_r: int = row
-        self.m_c: int = col
+        return tuple.__new__(cls, (level, row, col))
+
+
+
+    def __getnewargs__(self):
+        """
+        Arguments to pass to the constructor when unpickling/copying.
+        """
+        return tuple(self)
+
 
 
     def getRow(self)->int:
         """
         @returns Row of coordinate.
         """
-        return self.m_r
+        return self[1]
     
 
 
@@ -43,7 +60,7 @@ class Coordinates3D:
         """
         @returns Column of coordinate.
         """
-        return self.m_c
+        return self[2]
     
 
 
@@ -51,36 +68,31 @@ class Coordinates3D:
         """
         @returns Level of coordinate.
         """
-        return self.m_level
-    
+        return self[0]
 
 
-    def __eq__(self, other: Coordinates3D):
-        """
-        Define == operator.
 
-        @param other: Other coordinates that we are comparing with.
-        """
-        if other != None:
-            return self.m_level == other.getLevel() and self.m_r == other.getRow() and self.m_c == other.getCol()
-        else:
-            return False
-        
+    # Read-only access to the fields under their previous attribute names.
+    @property
+    def m_level(self)->int:
+        return self[0]
+
+
+
+    @property
+    def m_r(self)->int:
+        return self[1]
 
+
+
+    @property
+    def m_c(self)->int:
+        return self[2]
     
-    def __lt__(self, other: Coordinates3D):
-        """
-        Define < operator.
 
-        @param other: Other coordinates that we are comparing with.
-        """
 
-        if other != None:
-            return (self.m_level < other.getLevel()) or \
-                (self.m_level == other.getLevel() and self.m_r < other.getRow()) or \
-                    (self.m_level == other.getLevel() and self.m_r == other.getRow() and self.m_c < other.getCol())
-        else:
-            return False
+    # __eq__, __lt__ and __hash__ are the tuple ones: equality compares the three fields directly, ordering is by
+    # level, then row, then column, and the hash is computed arithmetically from the three integers.
 
 
 
@@ -91,23 +103,49 @@ class Coordinates3D:
         """
 
         if other != None:
-            return Coordinates3D(self.getLevel() + other.getLevel(), self.getRow() + other.getRow(), self.getCol() + other.getCol())
+            return Coordinates3D(self[0] + other[0], self[1] + other[1], self[2] + other[2])
 
 
 
-    def __hash__(self):
+    def __str__(self):
         """
-        Returns has value of Coordinates.  Needed for being a key in dictionaries.
+        Returns string representation of Coordinates.
         """
-        return hash(str(self.m_level) + '|' + str(self.m_r)+'|'+str(self.m_c))
-    
+        return '({level}, {row}, {col})'.format(level=self[0], row=self[1], col=self[2])
 
 
-    def __str__(self):
-        """
-        Returns has value of Coordinates.  Needed for being a key in dictionaries.
-        """
-        return '({level}, {row}, {col})'.format(level=self.m_level, row=self.m_r, col=self.m_c)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+
+def toLabels(labels)->List[Coordinates3D]:
+    """
+    Converts the labels passed to the batch methods of the graphs to a list of Coordinates3D.
+
+    @param labels: Sequence of Coordinates3D, or integer array of shape (n, 3) of (level, row, col).
+
+    @returns List of the labels as Coordinates3D.
+    """
+    if hasattr(labels, 'tolist'):
+        return [Coordinates3D(level, row, col) for (level, row, col) in labels.tolist()]
+    return labels if isinstance(labels, list) else list(labels)
+
+
+
+def toLabelPairs(pairs)->List[Tuple[Coordinates3D, Coordinates3D]]:
+    """
+    Converts the label pairs passed to the batch methods of the graphs to a list of pairs of Coordinates3D.
+
+    @param pairs: Sequence of (Coordinates3D, Coordinates3D) pairs, or integer array of shape (n, 2, 3) of
+        (level, row, col).
+
+    @returns List of the pairs as Coordinates3D.
+    """
+    if hasattr(pairs, 'tolist'):
+        return [(Coordinates3D(*vert1), Coordinates3D(*vert2)) for (vert1, vert2) in pairs.tolist()]
+    return pairs if isinstance(pairs, list) else list(pairs)
 
         
 ###########################################################################################################3
@@ -128,6 +166,8 @@ class WallCoordinates:
     Represent a wall coordinate essentially a pair of coordinates that uniquely identifies a wall.
     """
 
+    __slots__ = ('m_coord1st', 'm_coord2nd')
+
     def __init__(self, coord1: Coordinates3D, coord2: Coordinates3D):
         """
         Constructor.  We store the smaller coord as m_coord1st, and other as m_coord2nd.
@@ -169,7 +209,7 @@ class WallCoordinates:
         """
         if other != None:
             # we don't need to test for reverse, as WallCoordinates always have the first coordinate as the smaller coordinates.
-            return (self.m_coord1st == other.getFirst() and self.m_coord2nd == other.getSecond()) 
+            return (self.m_coord1st == other.m_coord1st and self.m_coord2nd == other.m_coord2nd)
         else:
             return False
 
@@ -179,4 +219,12 @@ class WallCoordinates:
         """
         @return: Returns hash value of WallCoordinates.  Needed for being a key in dictionaries.
         """
-        return hash(str(self.m_coord1st)+'-'+str(self.m_coord2nd))
\ No newline at end of file
+        return hash((self.m_coord1st, self.m_coord2nd))
+
+
+
+    def __str__(self):
+        """
+        Returns string representation of WallCoordinates.
+        """
+        return '{first}-{second}'.format(first=self.m_coord1st, second=self.m_coord2nd)
\ No newline at end of file
@@ -0,0 +1,164 @@
+# -------------------------------------------------------------------
+# Batch maze factory: generates many mazes of the same specification
+# in a pool of worker processes, paying interpreter startup and imports
+# once per worker rather than once per maze.
+#
+# Maze i is generated with random seed baseSeed + i, and is the same maze
+# mazeTester2.py generates for that randSeed.
+#
+# Run from the repository root:
+#   python3 mazeFactory.py <configuration file> <count> <output directory> [options]
+# -------------------------------------------------------------------
+
+
+import argparse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import json
+import os
+import random
+import time
+from typing import Iterator, List, Tuple, Union
+
+from generatorSelector import GeneratorSelector
+
+from maze.util import Coordinates3D
+from maze.maze3D import Maze3D
+from maze.gridGraph import GridGraph
+
+
+
+def buildMaze(levelSpecs: List[List[int]], genApproach: str, seed: int, entrances: List[List[int]] = (),
+              exits: List[List[int]] = (), genPolicy=None, path: str = None)->Union[Maze3D, str]:
+    """
+    Generates one maze, as mazeTester2.py does: stores the entrances and exits, seeds random, generates the maze, then
+    carves the entrances and exits.  Runs in the worker processes of generateMazes().
+
+    @param levelSpecs: (rowNum, colNum) of each level.
+    @param genApproach: Name of the generator, as passed to GeneratorSelector.construct().
+    @param seed: Seed for the random module.
+    @param entrances: (level, row, col) of each entrance.
+    @param exits: (level, row, col) of each exit.
+    @param genPolicy: Generator policy, as passed to GeneratorSelector.construct().
+    @param path: Path of the maze file to save the maze to (see Maze3D.save()), None to return the maze instead.
+
+    @returns The maze, or path if it was saved.
+    """
+    maze = Maze3D([(rowNum, colNum) for (rowNum, colNum) in levelSpecs], GridGraph())
+    for (l, r, c) in entrances:
+        maze.storeEntrance(Coordinates3D(l, r, c))
+    for (l, r, c) in exits:
+        maze.storeExit(Coordinates3D(l, r, c))
+
+    random.seed(seed)
+    generator = GeneratorSelector().construct(genApproach, genPolicy)
+    if generator is None:
+        raise ValueError('{} is an unknown generator approach.'.format(genApproach))
+    generator.generateMaze(maze)
+    maze.carveEntrances()
+    maze.carveExits()
+
+    if path is not None:
+        maze.save(path)
+        return path
+    return maze
+
+
+
+def generateMazes(levelSpecs: List[List[int]], genApproach: str, count: int, baseSeed: int = 0,
+                  entrances: List[List[int]] = (), exits: List[List[int]] = (), genPolicy=None, outDir: str = None,
+                  ordered: bool = True, workerNum: int = None)->Iterator[Tuple[int, Union[Maze3D, str]]]:
+    """
+    Generates count mazes in a pool of worker processes, yielding each as soon as it is available.  Only a few mazes
+    per worker are in flight at any time, so memory doesn't grow with count.
+
+    @param levelSpecs: (rowNum, colNum) of each level.
+    @param genApproach: Name of the generator, as passed to GeneratorSelector.construct().
+    @param count: Number of mazes to generate.
+    @param baseSeed: Seed of the first maze, maze i uses baseSeed + i.  Default is 0.
+    @param entrances: (level, row, col) of each entrance.
+    @param exits: (level, row, col) of each exit.
+    @param genPolicy: Generator policy, as passed to GeneratorSelector.construct().
+    @param outDir: Directory to save the mazes to, as maze_<seed>.mz3d, None to yield the mazes themselves.
+    @param ordered: Whether to yield the mazes in seed order, otherwise in the order they are finished.
+        Default is True.
+    @param workerNum: Number of worker processes.  Default is None, which uses one per CPU.  With 1, the mazes are
+        generated in this process.
+
+    @returns Iterator of (seed, maze) tuples, or (seed, path) if outDir is given.
+    """
+    seeds = range(baseSeed, baseSeed + count)
+    pathOf = lambda seed: os.path.join(outDir, 'maze_{}.mz3d'.format(seed)) if outDir is not None else None
+    if outDir is not None:
+        os.makedirs(outDir, exist_ok=True)
+
+    if workerNum == 1:
+        for seed in seeds:
+            # the mazes reseed random, restore its state for the caller
+            randomState = random.getstate()
+            result = buildMaze(levelSpecs, genApproach, seed, entrances, exits, genPolicy, pathOf(seed))
+            random.setstate(randomState)
+            yield (seed, result)
+        return
+
+    with ProcessPoolExecutor(max_workers=workerNum) as executor:
+        inFlightNum = 2 * (workerNum if workerNum is not None else os.cpu_count() or 1)
+        seedIter = iter(seeds)
+        submit = lambda seed: executor.submit(buildMaze, levelSpecs, genApproach, seed, entrances, exits, genPolicy,
+                                              pathOf(seed))
+        # futures of the mazes in flight, in seed order, and the seed of each
+        pending = deque()
+        seedOf = dict()
+        for seed in seedIter:
+            future = submit(seed)
+            pending.append(future)
+            seedOf[future] = seed
+            if len(pending) == inFlightNum:
+                break
+
+        while pending:
+            if ordered:
+                done = [pending[0]]
+            else:
+                (done, _) = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                pending.remove(future)
+                yield (seedOf.pop(future), future.result())
+
+                # keep the pool busy
+                seed = next(seedIter, None)
+                if seed is not None:
+                    nextFuture = submit(seed)
+                    pending.append(nextFuture)
+                    seedOf[nextFuture] = seed
+
+
+
+#
+# Main function, when the python script is executed, we execute this.
+#
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generates many mazes of the configuration file\'s specification '
+                                                 '(levelSpecs, entrances, exits, generator and generatorPolicy) '
+                                                 'and saves them to maze files.')
+    parser.add_argument('config', help='configuration file, as for mazeTester2.py')
+    parser.add_argument('count', type=int, help='number of mazes to generate')
+    parser.add_argument('outDir', help='directory to write the maze files to')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first maze, maze i uses seed + i')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes, default one per CPU')
+    parser.add_argument('--unordered', action='store_true', help='report mazes as they finish, not in seed order')
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as configFile:
+        configDict = json.load(configFile)
+
+    startTime: float = time.perf_counter()
+    for (seed, path) in generateMazes(configDict['levelSpecs'], configDict['generator'], args.count, args.seed,
+                                      configDict.get('entrances', []), configDict.get('exits', []),
+                                      configDict.get('generatorPolicy'), args.outDir, not args.unordered,
+                                      args.workers):
+        print('{} {}'.format(seed, path))
+    endTime: float = time.perf_counter()
+
+    print(f'Generated {args.count} mazes in {endTime - startTime:0.4f} seconds')
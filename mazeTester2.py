@@ -75,8 +75,21 @@ if __name__ == '__main__':
 		exits: List[List[int]] = configDict['exits']
 		# generator approach to use (appropriate for Tasks A, B, C)
 		genApproach: str = configDict['generator']
+		# Optional: Cell selection policy of the growing_tree generator, a policy name or a dictionary of policy
+		# names to weights, e.g., {"newest": 0.75, "random": 0.25}
+		genPolicy = None
+		if 'generatorPolicy' in configDict.keys():
+			genPolicy = configDict['generatorPolicy']
+		# Optional: Adversarial search options for Task D, e.g., {"timeBudget": 30, "workers": 4}
+		searchOptions = None
+		if 'taskDSearch' in configDict.keys():
+			searchOptions = dict(configDict['taskDSearch'])
 		# solver approach to use (appropriate for Tasks A, B and D)
 		solverApproach: str = configDict['solver']
+		# Optional: Integer cost of moving in each direction for the dijkstra solver, e.g., {"NE": 3, "SW": 3}
+		moveCosts = None
+		if 'moveCosts' in configDict.keys():
+			moveCosts = configDict['moveCosts']
 		# Optional: The index of which entrance to use (start at index 0) (appropraite for Tasks A, B and D)
 		solverEntIndex = None
 		if 'solverEntranceIndex' in configDict.keys():
@@ -116,7 +129,11 @@ if __name__ == '__main__':
 		# You can implement extra solvers, just make sure to update the list of solvers here
 		#
 		solverSelector: SolverSelector = SolverSelector()
-		solver: MazeSolver = solverSelector.construct(solverApproach)
+		try:
+			solver: MazeSolver = solverSelector.construct(solverApproach, moveCosts)
+		except ValueError as e:
+			print(e)
+			usage()
 		
 		# if solver is None, means it is an unknown solver
 		if solver == None:
@@ -133,10 +150,21 @@ if __name__ == '__main__':
 
 		if genApproach == 'taskD':
 			# this will select the generator based on the solver.
-			generator = genSelector.match(solver)
+			if searchOptions is not None:
+				# the search runs the solver as it will be run below
+				searchOptions.setdefault('entranceIndex', solverEntIndex)
+			try:
+				generator = genSelector.match(solver, searchOptions)
+			except ValueError as e:
+				print(e)
+				usage()
 		else: 
 			# this will select the generator according to specified input.
-			generator = genSelector.construct(genApproach)
+			try:
+				generator = genSelector.construct(genApproach, genPolicy)
+			except ValueError as e:
+				print(e)
+				usage()
 
 			# if generator is None, means it is an unknown generator
 			if generator == None:
@@ -159,6 +187,12 @@ if __name__ == '__main__':
 
 		print(f'Generation took {endGenTime - startGenTime:0.4f} seconds')
 
+		# report how the Task D adversarial search went, if it ran
+		if genApproach == 'taskD' and generator.getSearch() is not None:
+			search = generator.getSearch()
+			print(f'Adversarial search scored {search.m_evalNum} mazes in {search.m_searchTime:0.2f} seconds '
+				  f'({search.evalRate():0.1f} evaluations/second), best explored {search.m_bestScore:g} cells')
+
 		# carve out the entrances and exits
 		maze.carveEntrances()
 		maze.carveExits()
@@ -2,6 +2,9 @@ from solving.recurBackMazeSolver import RecurBackMazeSolver
 from solving.wallFollowingSolver import WallFollowingMazeSolver
 from solving.pledgeSolver import PledgeMazeSolver
 from solving.taskCMazeSolver import TaskCMazeSolver
+from solving.bidirectionalBFSSolver import BidirectionalBFSMazeSolver
+from solving.aStarSolver import AStarMazeSolver
+from solving.dijkstraSolver import DijkstraMazeSolver
 from solving.mazeSolver import MazeSolver
 
 
@@ -11,12 +14,14 @@ class SolverSelector:
     """
 
 
-    def construct(self, solverApproach: str)->MazeSolver:
+    def construct(self, solverApproach: str, moveCosts: dict = None)->MazeSolver:
         """
         Task A, B and D, with a specified maze generator.
         If solverApproach is unknown, None will be returned.
 
         @param solverApproach: Name of solver to use.
+        @param moveCosts: Integer cost of moving in each direction ('N', 'NE', 'E', 'S', 'SW', 'W') for the 'dijkstra'
+            solver (see DijkstraMazeSolver).  Default is None, all moves costing 1.
         
         @return: Instance of a maze generator.
         """
@@ -30,6 +35,12 @@ class SolverSelector:
             solver = PledgeMazeSolver()
         elif solverApproach == 'taskC':
             solver = TaskCMazeSolver()
+        elif solverApproach == 'bidir':
+            solver = BidirectionalBFSMazeSolver()
+        elif solverApproach == 'astar':
+            solver = AStarMazeSolver()
+        elif solverApproach == 'dijkstra':
+            solver = DijkstraMazeSolver(moveCosts)
         # TODO: If you implement other solvers, you can add them here
 
         return solver
@@ -0,0 +1,131 @@
+from heapq import heappop, heappush
+from typing import Dict, List
+
+from maze.maze3D import Maze3D
+from maze.util import Coordinates3D
+from solving.mazeSolver import MazeSolver
+
+
+class AStarMazeSolver(MazeSolver):
+    """
+    A* solver, finding a shortest path from the entrance to the nearest exit.
+
+    The open set is a heap of (f, h, id) tuples over integer cell ids, with stale entries skipped when popped, and the
+    neighbours of a cell come from the maze's neighbour table.  The heuristic is the 3D Manhattan distance to the
+    closest exit: every move changes the level, row or column by one, so it never overestimates, and moving to a
+    neighbour changes it by at most one, so no cell needs expanding twice.  Level changes count like any other move,
+    and the level term steers the search towards the exits' levels.
+
+    Each expanded cell is recorded with solverPathAppend(), so getCellsExplored() is comparable with the other solvers,
+    and getCellsExpanded() gives the interior cells expanded.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.m_name = "astar"
+        # cells from the entrance to the exit used, once solved
+        self.m_path: List[Coordinates3D] = list()
+        # number of interior cells expanded
+        self.m_cellsExpanded: int = 0
+
+    def getName(self):
+        return self.m_name
+
+
+
+    def solveMaze(self, maze: Maze3D, entrance: Coordinates3D):
+        self.m_solved = False
+        self.m_entranceUsed = entrance
+        self.m_path = list()
+        self.m_cellsExpanded = 0
+
+        cellNum = maze.interiorCellNum()
+        (neighbourTable, degrees) = maze.idNeighbourTable()
+        directionNum = Maze3D.WALL_DIRECTION_NUM
+
+        # exits get ids after the interior cells, and are reached from the interior cells they open onto
+        exits = maze.getExits()
+        exitPositions = [(exit.getLevel(), exit.getRow(), exit.getCol()) for exit in exits]
+        exitsOf: Dict[int, List[int]] = dict()
+        for k, exit in enumerate(exits):
+            for neigh in maze.neighbours(exit):
+                neighId = maze.cellId(neigh)
+                if neighId >= 0 and not maze.hasWall(exit, neigh):
+                    exitsOf.setdefault(neighId, list()).append(cellNum + k)
+
+        def heuristic(cellId: int)->int:
+            cell = maze.coordOf(cellId)
+            (level, row, col) = (cell.getLevel(), cell.getRow(), cell.getCol())
+            return min(abs(level - exitLevel) + abs(row - exitRow) + abs(col - exitCol)
+                       for (exitLevel, exitRow, exitCol) in exitPositions)
+
+        self.solverPathAppend(entrance, False)
+        if entrance in exits:
+            self.m_path = [entrance]
+            self.solved(entrance, entrance)
+            return
+
+        # the entrance is the root of the search, with parent -1
+        gScores: Dict[int, int] = dict()
+        parents: Dict[int, int] = dict()
+        openSet = list()
+        for neigh in maze.neighbours(entrance):
+            neighId = maze.cellId(neigh)
+            if neighId >= 0 and not maze.hasWall(entrance, neigh) and neighId not in gScores:
+                gScores[neighId] = 1
+                parents[neighId] = -1
+                h = heuristic(neighId)
+                heappush(openSet, (1 + h, h, neighId))
+
+        closed = set()
+        goal = -1
+        while openSet:
+            (f, h, cellId) = heappop(openSet)
+            if cellId in closed:
+                continue
+            if cellId >= cellNum:
+                goal = cellId
+                break
+            closed.add(cellId)
+            self.m_cellsExpanded += 1
+            self.solverPathAppend(maze.coordOf(cellId), False)
+
+            g = f - h
+            successors = [neighbourTable[k] for k in range(cellId * directionNum, cellId * directionNum + degrees[cellId])
+                          if not maze.idHasWall(cellId, neighbourTable[k])]
+            for neighId in successors + exitsOf.get(cellId, []):
+                if neighId in closed or g + 1 >= gScores.get(neighId, g + 2):
+                    continue
+                gScores[neighId] = g + 1
+                parents[neighId] = cellId
+                neighH = heuristic(neighId) if neighId < cellNum else 0
+                heappush(openSet, (g + 1 + neighH, neighH, neighId))
+
+        if goal < 0:
+            return
+
+        exit = exits[goal - cellNum]
+        self.solverPathAppend(exit, False)
+        cellId = parents[goal]
+        while cellId >= 0:
+            self.m_path.append(maze.coordOf(cellId))
+            cellId = parents[cellId]
+        self.m_path = [entrance] + self.m_path[::-1] + [exit]
+
+        self.solved(entrance, exit)
+
+
+
+    def getCellsExpanded(self)->int:
+        """
+        @return Number of interior cells expanded by the last search.
+        """
+        return self.m_cellsExpanded
+
+
+
+    def getPath(self)->List[Coordinates3D]:
+        """
+        @return The path found from the entrance to the exit used, both included.  Empty if the maze wasn't solved.
+        """
+        return self.m_path
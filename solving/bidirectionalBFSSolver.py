@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional
+
+from maze.maze3D import Maze3D
+from maze.util import Coordinates3D
+from solving.mazeSolver import MazeSolver
+
+
+class BidirectionalBFSMazeSolver(MazeSolver):
+    """
+    Bidirectional breadth first search solver.
+
+    One frontier grows from the entrance and another from all the exits at once, a whole BFS layer at a time, always
+    expanding the smaller frontier.  The search stops as soon as a cell is reached from both sides, and the path is
+    stitched together from the parents of each side.  On large mazes the two searches together visit far fewer cells
+    than a BFS from the entrance alone.  Cells reached by either frontier are recorded with solverPathAppend().
+
+    Moves between interior cells go both ways, so the exit side uses the same passable neighbours as the entrance
+    side.  It never reaches the entrance, which is only ever left, so the frontiers meet on an interior cell.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.m_name = "bidir"
+        # cells from the entrance to the exit used, once solved
+        self.m_path: List[Coordinates3D] = list()
+
+    def getName(self):
+        return self.m_name
+
+
+
+    def solveMaze(self, maze: Maze3D, entrance: Coordinates3D):
+        self.m_solved = False
+        self.m_entranceUsed = entrance
+        self.m_path = list()
+
+        # parent of each cell reached from the entrance, and next cell towards an exit of each cell reached from them
+        fromEntrance: Dict[Coordinates3D, Optional[Coordinates3D]] = {entrance: None}
+        toExit: Dict[Coordinates3D, Optional[Coordinates3D]] = dict()
+        self.solverPathAppend(entrance, False)
+        for exit in maze.getExits():
+            if exit not in toExit:
+                toExit[exit] = None
+                self.solverPathAppend(exit, False)
+
+        entranceFrontier = [entrance]
+        exitFrontier = list(toExit)
+        meeting = entrance if entrance in toExit else None
+
+        while meeting is None and entranceFrontier and exitFrontier:
+            # expand the smaller frontier by a whole layer
+            if len(entranceFrontier) <= len(exitFrontier):
+                (frontier, parents, others) = (entranceFrontier, fromEntrance, toExit)
+            else:
+                (frontier, parents, others) = (exitFrontier, toExit, fromEntrance)
+
+            nextFrontier = list()
+            for cell in frontier:
+                for neigh in maze.passableNeighbours(cell):
+                    if neigh not in parents:
+                        parents[neigh] = cell
+                        nextFrontier.append(neigh)
+                        self.solverPathAppend(neigh, False)
+                        if neigh in others:
+                            meeting = neigh
+                            break
+                if meeting is not None:
+                    break
+
+            if parents is fromEntrance:
+                entranceFrontier = nextFrontier
+            else:
+                exitFrontier = nextFrontier
+
+        if meeting is None:
+            return
+
+        # entrance to the meeting cell, then on to the exit
+        cell = meeting
+        while cell is not None:
+            self.m_path.append(cell)
+            cell = fromEntrance[cell]
+        self.m_path.reverse()
+        cell = toExit[meeting]
+        while cell is not None:
+            self.m_path.append(cell)
+            cell = toExit[cell]
+
+        self.solved(entrance, self.m_path[-1])
+
+
+
+    def getPath(self)->List[Coordinates3D]:
+        """
+        @return The path found from the entrance to the exit used, both included.  Empty if the maze wasn't solved.
+        """
+        return self.m_path
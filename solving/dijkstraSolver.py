@@ -0,0 +1,127 @@
+from typing import Dict, List, Optional
+
+from maze.maze3D import Maze3D
+from maze.util import Coordinates3D
+from solving.mazeSolver import MazeSolver
+from solving.wallFollowingSolver import DIRECTION_VECTORS
+
+
+class DijkstraMazeSolver(MazeSolver):
+    """
+    Dijkstra solver for mazes where moves cost different amounts depending on their direction, e.g., changing level
+    (NE/SW) costing more than moving within a level.  Finds a cheapest path from the entrance to any exit.
+
+    Costs are small positive integers, so the priority queue is a bucket queue (Dial's algorithm): a ring of
+    maxCost + 1 lists of cells, indexed by distance modulo the ring size, which holds every tentative distance still
+    pending.  Pushing and popping take constant time, so the search runs in time linear in the cells and moves
+    explored, plus the largest distance, rather than paying the log factor of a heap.
+
+    Each settled cell is recorded with solverPathAppend().
+    """
+
+    def __init__(self, moveCosts: Dict[str, int] = None):
+        """
+        Constructor.
+
+        @param moveCosts: Cost of a move in each direction of DIRECTION_VECTORS ('N', 'NE', 'E', 'S', 'SW', 'W'), as
+            positive integers.  Directions not given cost 1.  Default is None, all moves costing 1.
+        """
+        super().__init__()
+        self.m_name = "dijkstra"
+
+        moveCosts = dict(moveCosts) if moveCosts is not None else dict()
+        for (direction, cost) in moveCosts.items():
+            if direction not in DIRECTION_VECTORS:
+                raise ValueError('{} is an unknown move direction.'.format(direction))
+            if not isinstance(cost, int) or cost < 1:
+                raise ValueError('Cost of moving {} must be a positive integer.'.format(direction))
+
+        # cost of each move, by (level, row, col) offset
+        self.m_moveCosts: Dict[tuple, int] = {(dl, dr, dc): moveCosts.get(direction, 1)
+                                              for (direction, (dc, dr, dl)) in DIRECTION_VECTORS.items()}
+        # cells from the entrance to the exit used, and the cost of that path, once solved
+        self.m_path: List[Coordinates3D] = list()
+        self.m_pathCost: int = -1
+
+    def getName(self):
+        return self.m_name
+
+
+
+    def solveMaze(self, maze: Maze3D, entrance: Coordinates3D):
+        self.m_solved = False
+        self.m_entranceUsed = entrance
+        self.m_path = list()
+        self.m_pathCost = -1
+
+        moveCosts = self.m_moveCosts
+        ringSize = max(moveCosts.values()) + 1
+        exits = set(maze.getExits())
+
+        # tentative distance and parent of each cell reached
+        distances: Dict[Coordinates3D, int] = {entrance: 0}
+        parents: Dict[Coordinates3D, Optional[Coordinates3D]] = {entrance: None}
+        settled = set()
+        buckets: List[List[Coordinates3D]] = [list() for _ in range(0, ringSize)]
+        buckets[0].append(entrance)
+        pendingNum = 1
+        distance = 0
+        reached = None
+
+        while pendingNum > 0:
+            bucket = buckets[distance % ringSize]
+            if not bucket:
+                distance += 1
+                continue
+
+            cell = bucket.pop()
+            pendingNum -= 1
+            # skip entries superseded by a shorter distance
+            if cell in settled or distances[cell] != distance:
+                continue
+            settled.add(cell)
+            self.solverPathAppend(cell, False)
+
+            if cell in exits:
+                reached = cell
+                break
+
+            (level, row, col) = (cell.getLevel(), cell.getRow(), cell.getCol())
+            for neigh in maze.passableNeighbours(cell):
+                if neigh in settled:
+                    continue
+                neighDistance = distance + moveCosts[(neigh.getLevel() - level, neigh.getRow() - row, neigh.getCol() - col)]
+                if neighDistance < distances.get(neigh, neighDistance + 1):
+                    distances[neigh] = neighDistance
+                    parents[neigh] = cell
+                    buckets[neighDistance % ringSize].append(neigh)
+                    pendingNum += 1
+
+        if reached is None:
+            return
+
+        cell = reached
+        while cell is not None:
+            self.m_path.append(cell)
+            cell = parents[cell]
+        self.m_path.reverse()
+        self.m_pathCost = distances[reached]
+
+        self.solved(entrance, reached)
+
+
+
+    def getPath(self)->List[Coordinates3D]:
+        """
+        @return The cheapest path found from the entrance to the exit used, both included.  Empty if the maze wasn't
+            solved.
+        """
+        return self.m_path
+
+
+
+    def getPathCost(self)->int:
+        """
+        @return Total move cost of the path found, or -1 if the maze wasn't solved.
+        """
+        return self.m_pathCost
@@ -63,12 +63,8 @@ class PledgeMazeSolver(MazeSolver):
 
     def _try_move(self, maze: Maze3D, current: Coordinates3D,
                   direction: str, exits: set):
-        for n in maze.neighbours(current):
-            if maze.hasWall(current, n):
-                continue
-            if direction_of(current, n) != direction:
-                continue
-            if self._is_interior(maze, n) or n in exits:
+        for n in maze.passableNeighbours(current):
+            if direction_of(current, n) == direction:
                 return n
         return None
 
@@ -80,10 +76,8 @@ class PledgeMazeSolver(MazeSolver):
             current, path = queue.popleft()
             if current in exits:
                 return path
-            for n in maze.neighbours(current):
-                if n in visited or maze.hasWall(current, n):
-                    continue
-                if not self._is_interior(maze, n) and n not in exits:
+            for n in maze.passableNeighbours(current):
+                if n in visited:
                     continue
                 visited.add(n)
                 queue.append((n, path + [n]))
@@ -98,8 +92,8 @@ class PledgeMazeSolver(MazeSolver):
         self.solverPathAppend(entrance, False)
 
         chosen_dir = None
-        for n in maze.neighbours(entrance):
-            if not maze.hasWall(entrance, n) and self._is_interior(maze, n):
+        for n in maze.passableNeighbours(entrance):
+            if self._is_interior(maze, n):
                 d = direction_of(entrance, n)
                 if d is not None:
                     chosen_dir = d
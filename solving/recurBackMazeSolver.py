@@ -33,14 +33,11 @@ class RecurBackMazeSolver(MazeSolver):
         self.solverPathAppend(startCoord, False)
 
     
-        while currCell not in maze.getExits():
-			# find all neighbours of current cell
-            neighbours : list[Coordinates3D] = maze.neighbours(currCell)
-
-			# filter to ones that haven't been visited and within boundary and doesn't have a wall between them	
-            nonVisitedNeighs : list[Coordinates3D] = [neigh for neigh in neighbours if neigh not in visited and not maze.hasWall(currCell,neigh) and\
-											 (neigh.getRow() >= -1) and (neigh.getRow() <= maze.rowNum(neigh.getLevel())) and\
-												(neigh.getCol() >= -1) and (neigh.getCol() <= maze.colNum(neigh.getLevel()))]
+        exits: set[Coordinates3D] = set(maze.getExits())
+        while currCell not in exits:
+			# filter the passable neighbours of current cell (no wall in between, and interior or an exit) to ones that
+			# haven't been visited
+            nonVisitedNeighs : list[Coordinates3D] = [neigh for neigh in maze.passableNeighbours(currCell) if neigh not in visited]
 
 			# see if any unvisited neighbours
             if len(nonVisitedNeighs) > 0:
@@ -64,7 +61,7 @@ class RecurBackMazeSolver(MazeSolver):
                 self.solverPathAppend(currCell, True)
 
         # ensure we are currently at the exit
-        if currCell in maze.getExits():
+        if currCell in exits:
             self.solved(entrance, currCell)
 
 	
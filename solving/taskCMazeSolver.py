@@ -4,16 +4,6 @@ from maze.util import Coordinates3D
 from maze.maze3D import Maze3D
 from solving.mazeSolver import MazeSolver
 
-# Define the possible directions of movement, including level transitions
-DIRECTIONS = [
-    (0, -1, 0),    # North
-    (0, 0, 1),     # North-East (up one level)
-    (1, 0, 0),     # East
-    (0, 1, 0),     # South
-    (0, 0, -1),    # South-West (down one level)
-    (-1, 0, 0)     # West
-]
-
 class TaskCMazeSolver(MazeSolver):
     
     """
@@ -32,83 +22,64 @@ class TaskCMazeSolver(MazeSolver):
     def getName(self):
         return self.m_name
     
-    def is_valid_move(self, maze: Maze3D, current_position: Coordinates3D, next_position: Coordinates3D) -> bool:
+    def exit_distance_field(self, maze: Maze3D, entrances: List[Coordinates3D]) -> Dict[Coordinates3D, Tuple[Coordinates3D, int, Coordinates3D]]:
         """
-        Checks if the move to the next position is valid.
+        Explores the maze with a single BFS seeded from all exits at once, labelling each cell with its distance to the
+        nearest exit, that exit, and the next cell on the way there.  Stops once every entrance is labelled.  As an
+        entrance is only ever left, never entered, it is labelled from the interior cell it opens onto.
         """
-        if not maze.hasCell(next_position):
-            return False
-        if maze.hasWall(current_position, next_position):
-            return False
-        return True
+        exits = maze.getExits()
+        field = {exit: (None, 0, exit) for exit in exits}
+        queue = deque(exits)
+        unique_cells_explored = 0
 
-    def bfs_explore(self, maze: Maze3D, start: Coordinates3D) -> Dict[Coordinates3D, Tuple[Coordinates3D, int]]:
-        """
-        Explores the maze using BFS to find all reachable cells and distances from the start position.
-        """
-        queue = deque([start])
-        visited = {start: (None, 0)}
-        unique_cells_explored = set()
-        exits = set(maze.getExits())
+        # entrances still to label, by the cells they open onto
+        entrances_of: Dict[Coordinates3D, List[Coordinates3D]] = {}
+        for entrance in entrances:
+            for next_position in maze.passableNeighbours(entrance):
+                entrances_of.setdefault(next_position, []).append(entrance)
+        # entrances that are exits are labelled already, and ones opening onto no cell can't be
+        remaining = len({entrance for waiting in entrances_of.values() for entrance in waiting if entrance not in field})
 
-        while queue:
+        while queue and remaining > 0:
             current_position = queue.popleft()
-            current_distance = visited[current_position][1]
-            unique_cells_explored.add(current_position)
-
-            if current_position in exits:
-                exits.remove(current_position)
-                if not exits:
-                    break
-
-            for direction in DIRECTIONS:
-                next_position = Coordinates3D(
-                    current_position.getLevel() + direction[2],
-                    current_position.getRow() + direction[1],
-                    current_position.getCol() + direction[0]
-                )
-                if self.is_valid_move(maze, current_position, next_position) and next_position not in visited:
-                    queue.append(next_position)
-                    visited[next_position] = (current_position, current_distance + 1)
+            (_, current_distance, nearest_exit) = field[current_position]
+            unique_cells_explored += 1
 
-        self.cells_explored = len(unique_cells_explored)
-        return visited
+            for entrance in entrances_of.get(current_position, []):
+                if entrance not in field:
+                    field[entrance] = (current_position, current_distance + 1, nearest_exit)
+                    remaining -= 1
 
-    def backtrack_path(self, visited: Dict[Coordinates3D, Tuple[Coordinates3D, int]], start: Coordinates3D, end: Coordinates3D) -> List[Coordinates3D]:
-        """
-        Backtracks to find the path from start to end using the visited dictionary.
-        """
-        path = []
-        current = end
-        while current != start:
-            path.append(current)
-            current = visited[current][0]
-        path.append(start)
-        path.reverse()
-        return path
+            # moves are symmetric between interior cells, so these are also the cells that can move here
+            for next_position in maze.passableNeighbours(current_position):
+                if next_position not in field:
+                    queue.append(next_position)
+                    field[next_position] = (current_position, current_distance + 1, nearest_exit)
+
+        self.cells_explored = unique_cells_explored
+        return field
 
     def solveMazeTaskC(self, maze: Maze3D):
         """
-        Solves the maze to find the closest entrance-exit pair.
+        Solves the maze to find the closest entrance-exit pair, answering every entrance from one distance field
+        (see exit_distance_field()).
         """
         entrances = maze.getEntrances()
-        all_exits = maze.getExits()
-        best_cost = float('inf')
+        field = self.exit_distance_field(maze, entrances)
         best_path = []
         best_entrance = None
         best_exit = None
 
-        for entrance in entrances:
-            visited = self.bfs_explore(maze, entrance)
-            for exit in all_exits:
-                if exit in visited:
-                    path_to_exit = self.backtrack_path(visited, entrance, exit)
-                    total_cost = len(path_to_exit) + self.cells_explored
-                    if total_cost < best_cost:
-                        best_cost = total_cost
-                        best_path = path_to_exit
-                        best_entrance = entrance
-                        best_exit = exit
+        reached = [entrance for entrance in entrances if entrance in field]
+        if reached:
+            best_entrance = min(reached, key=lambda entrance: field[entrance][1])
+            best_exit = field[best_entrance][2]
+            # follow the field down to the exit
+            current = best_entrance
+            while current is not None:
+                best_path.append(current)
+                current = field[current][0]
 
         self.entrance_used = best_entrance
         self.exit_used = best_exit
@@ -82,12 +82,8 @@ class WallFollowingMazeSolver(MazeSolver):
         Return the neighbour in `direction` if reachable (no wall) and
         is either an interior cell or an exit. Returns None otherwise.
         """
-        for n in maze.neighbours(current):
-            if maze.hasWall(current, n):
-                continue
-            if direction_of(current, n) != direction:
-                continue
-            if self._is_interior(maze, n) or n in exits:
+        for n in maze.passableNeighbours(current):
+            if direction_of(current, n) == direction:
                 return n
         return None
 
@@ -106,10 +102,8 @@ class WallFollowingMazeSolver(MazeSolver):
             if current in exits:
                 return path
 
-            for n in maze.neighbours(current):
-                if n in visited or maze.hasWall(current, n):
-                    continue
-                if not self._is_interior(maze, n) and n not in exits:
+            for n in maze.passableNeighbours(current):
+                if n in visited:
                     continue
                 visited.add(n)
                 queue.append((n, path + [n]))
@@ -130,8 +124,8 @@ class WallFollowingMazeSolver(MazeSolver):
         self.solverPathAppend(entrance, False)
 
         facing = None
-        for n in maze.neighbours(entrance):
-            if not maze.hasWall(entrance, n) and self._is_interior(maze, n):
+        for n in maze.passableNeighbours(entrance):
+            if self._is_interior(maze, n):
                 d = direction_of(entrance, n)
                 if d is not None:
                     facing  = d
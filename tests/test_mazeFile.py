@@ -0,0 +1,27 @@
+import pickle
+import random
+
+import numpy as np
+
+from generatorSelector import GeneratorSelector
+from maze.gridGraph import GridGraph
+from maze.maze3D import Maze3D
+from maze.mazeFile import wallArray
+from maze.util import Coordinates3D
+
+
+def testMmapMazePicklesWithWalls(tmp_path):
+    random.seed(5)
+    saved = Maze3D([(4, 6), (5, 3)], GridGraph())
+    saved.storeEntrance(Coordinates3D(0, 2, -1))
+    saved.storeExit(Coordinates3D(1, 5, 0))
+    GeneratorSelector().construct('kruskal').generateMaze(saved)
+    saved.carveEntrances()
+    saved.carveExits()
+    saved.save(str(tmp_path / 'maze.mz3d'))
+
+    with Maze3D.open(str(tmp_path / 'maze.mz3d')) as opened:
+        copied = pickle.loads(pickle.dumps(opened))
+
+    assert type(copied.m_graph) is GridGraph
+    assert np.array_equal(wallArray(copied.m_levelDims, copied.m_graph), wallArray(saved.m_levelDims, saved.m_graph))
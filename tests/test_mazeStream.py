@@ -0,0 +1,42 @@
+import random
+
+import numpy as np
+import pytest
+
+from generatorSelector import GeneratorSelector
+from maze.gridGraph import GridGraph
+from maze.maze3D import Maze3D
+from maze.mazeFile import wallArray
+from maze.mazeStream import readMaze, writeMaze
+from maze.util import Coordinates3D
+
+
+def savedMaze(path: str)->Maze3D:
+    """
+    @returns A carved maze of uneven levels, saved to path.
+    """
+    random.seed(11)
+    maze = Maze3D([(5, 7), (4, 4), (6, 3)], GridGraph())
+    maze.storeEntrance(Coordinates3D(0, -1, 2))
+    maze.storeExit(Coordinates3D(2, 6, 1))
+    GeneratorSelector().construct('kruskal').generateMaze(maze)
+    maze.carveEntrances()
+    maze.carveExits()
+    maze.save(path)
+    return maze
+
+
+
+@pytest.mark.parametrize('useMmap', [False, True])
+def testOpenedMazeStreamsBack(tmp_path, useMmap):
+    saved = savedMaze(str(tmp_path / 'maze.mz3d'))
+
+    with Maze3D.open(str(tmp_path / 'maze.mz3d'), useMmap) as opened:
+        assert opened.touchedLevels() == [0, 1, 2]
+        writeMaze(opened, str(tmp_path / 'maze.mz3s'))
+        assert np.array_equal(wallArray(opened.m_levelDims, opened.m_graph), wallArray(saved.m_levelDims, saved.m_graph))
+
+    streamed = readMaze(str(tmp_path / 'maze.mz3s'))
+    assert streamed.getEntrances() == saved.getEntrances()
+    assert streamed.getExits() == saved.getExits()
+    assert np.array_equal(wallArray(streamed.m_levelDims, streamed.m_graph), wallArray(saved.m_levelDims, saved.m_graph))